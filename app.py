@@ -1,6 +1,5 @@
 from flask import Flask
 from flask_cors import CORS
-from flask_sqlalchemy import SQLAlchemy
 from dotenv import load_dotenv
 import os
 import sys
@@ -8,93 +7,233 @@ import sys
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Load environment variables
-load_dotenv()
-
-# Initialize Flask app
-app = Flask(__name__)
-
-# Enable CORS for all routes
-CORS(app, origins="*")
-
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///cheer_guru.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
-
-# Initialize database
-db = SQLAlchemy(app)
-
-# Make db available to models
-import app.models.job
-import app.models.service_provider
-app.models.job.db = db
-app.models.service_provider.db = db
-
-# Import models after db initialization
+from app.extensions import db
 from app.models.job import Job, JobType, ProgramType, JobStatus
 from app.models.service_provider import ServiceProvider, ExperienceLevel, ServiceStatus
+from app.models.scrape_run import ScrapeRun, ScrapeRunStatus
+from app.services.sqlite_profile import sqlite_engine_options, apply_sqlite_pragmas
+from app.services.db_routing import REPLICA_BIND
+from app.services.serializers import RowSerializer
+from app.services.row_index import RowIndex
+from app.services.compression import ResponseCompressor
+from app.services.query_cache import QueryCache
+from app.services.request_deadlines import RequestDeadlines
+from app.services.metrics import RequestMetrics
+from app.services.query_tracker import QueryTracker
+
+def load_config():
+    """Read the application configuration from the environment"""
+    # Load environment variables
+    load_dotenv()
 
-# Import routes
-from app.routes.jobs import jobs_bp
-from app.routes.providers import providers_bp
-from app.routes.scraper import scraper_bp
-
-# Import services
-from app.services.job_scraper import JobScraper
-
-# Inject dependencies into routes
-import app.routes.jobs as jobs_module
-jobs_module.db = db
-jobs_module.Job = Job
-jobs_module.JobType = JobType
-jobs_module.ProgramType = ProgramType
-jobs_module.JobStatus = JobStatus
-
-import app.routes.providers as providers_module
-providers_module.db = db
-providers_module.ServiceProvider = ServiceProvider
-providers_module.ExperienceLevel = ExperienceLevel
-providers_module.ServiceStatus = ServiceStatus
-
-import app.routes.scraper as scraper_module
-scraper_module.db = db
-scraper_module.Job = Job
-scraper_module.JobScraper = JobScraper
-
-# Inject dependencies into services
-import app.services.job_scraper as job_scraper_module
-job_scraper_module.db = db
-job_scraper_module.Job = Job
-job_scraper_module.JobType = JobType
-job_scraper_module.ProgramType = ProgramType
-job_scraper_module.JobStatus = JobStatus
-
-# Register blueprints
-app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
-app.register_blueprint(providers_bp, url_prefix='/api/providers')
-app.register_blueprint(scraper_bp, url_prefix='/api/scraper')
-
-@app.route('/')
-def index():
     return {
-        'message': 'Cheer Guru Connect API',
-        'version': '2.0.0',
-        'endpoints': {
-            'jobs': '/api/jobs',
-            'providers': '/api/providers',
-            'scraper': '/api/scraper'
-        }
+        # Database configuration
+        'SQLALCHEMY_DATABASE_URI': os.getenv('DATABASE_URL', 'sqlite:///cheer_guru.db'),
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'DATABASE_REPLICA_URL': os.getenv('DATABASE_REPLICA_URL'),
+        'SQLITE_PRODUCTION_PROFILE': os.getenv('SQLITE_PRODUCTION_PROFILE', 'true').lower() == 'true',
+        'SQLITE_POOL_SIZE': int(os.getenv('SQLITE_POOL_SIZE', 10)),
+        'SECRET_KEY': os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production'),
+        'SERIALIZATION_CACHE_SIZE': int(os.getenv('SERIALIZATION_CACHE_SIZE', 10000)),
+        'QUERY_CACHE_SIZE': int(os.getenv('QUERY_CACHE_SIZE', 0)),
+        'QUERY_CACHE_TTL': int(os.getenv('QUERY_CACHE_TTL', 60)),
+        'QUERY_CACHE_URL': os.getenv('QUERY_CACHE_URL'),
+        'API_REQUEST_TIMEOUT': int(os.getenv('API_REQUEST_TIMEOUT', 30)),
+        'SCRAPER_REQUEST_TIMEOUT': int(os.getenv('SCRAPER_REQUEST_TIMEOUT', 900)),
+        'METRICS_DIR': os.getenv('METRICS_DIR'),
+        'QUERY_TRACKING': os.getenv('QUERY_TRACKING', 'false').lower() == 'true',
+        'SLOW_QUERY_THRESHOLD': float(os.getenv('SLOW_QUERY_THRESHOLD', 0.1)),
+        'JOB_INDEX': os.getenv('JOB_INDEX', 'false').lower() == 'true',
+        'JOB_INDEX_RECONCILE_INTERVAL': int(os.getenv('JOB_INDEX_RECONCILE_INTERVAL', 30)),
+        'FUZZY_SEARCH': os.getenv('FUZZY_SEARCH', 'true').lower() == 'true',
+        'JOB_SUGGESTIONS': os.getenv('JOB_SUGGESTIONS', 'true').lower() == 'true'
     }
 
-@app.route('/health')
-def health_check():
-    return {'status': 'healthy', 'database': 'connected'}
+def configure_database(app):
+    """Engine options for the primary and the optional read replica"""
+    sqlite_profile = app.config['SQLITE_PRODUCTION_PROFILE']
+    pool_size = app.config['SQLITE_POOL_SIZE']
+
+    # SQLite production profile: WAL, tuned pragmas and a connection pool
+    if sqlite_profile:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = sqlite_engine_options(
+            app.config['SQLALCHEMY_DATABASE_URI'],
+            pool_size=pool_size
+        )
+
+    # Optional read replica: GET requests read from it, writes use the primary
+    replica_url = app.config['DATABASE_REPLICA_URL']
+    if replica_url:
+        replica_options = sqlite_engine_options(replica_url, pool_size=pool_size) if sqlite_profile else {}
+        app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND: {'url': replica_url, **replica_options}}
+
+    db.init_app(app)
+
+    if sqlite_profile:
+        with app.app_context():
+            for engine in db.engines.values():
+                apply_sqlite_pragmas(engine)
+
+def load_job_scraper():
+    """
+    Import the scraper stack on first use and wire its dependencies
+
+    Returns:
+        The JobScraper class
+    """
+    import app.services.job_scraper as job_scraper_module
+    job_scraper_module.db = db
+    job_scraper_module.Job = Job
+    job_scraper_module.JobType = JobType
+    job_scraper_module.ProgramType = ProgramType
+    job_scraper_module.JobStatus = JobStatus
+    job_scraper_module.ScrapeRun = ScrapeRun
+    return job_scraper_module.JobScraper
+
+def register_blueprints(app):
+    """
+    Inject route dependencies and register the API blueprints
+
+    The route modules hold their dependencies as module globals and the
+    blueprints are module-level, so every call rewires the routes of every
+    app created before to this app's serializers, indexes and flags.
+    """
+    import app.routes.jobs as jobs_module
+    import app.routes.providers as providers_module
+    import app.routes.scraper as scraper_module
+
+    # Projected list serializers with a per-row encoded JSON cache
+    cache_size = app.config['SERIALIZATION_CACHE_SIZE']
+
+    jobs_module.db = db
+    jobs_module.Job = Job
+    jobs_module.JobType = JobType
+    jobs_module.ProgramType = ProgramType
+    jobs_module.JobStatus = JobStatus
+    jobs_module.job_serializer = RowSerializer(Job, 'last_updated', cache_size=cache_size)
+
+    # In-memory job index: answers every listing with JOB_INDEX, match=fuzzy
+    # searches with FUZZY_SEARCH and /suggest with JOB_SUGGESTIONS
+    jobs_module.job_index = None
+    jobs_module.listings_from_index = app.config['JOB_INDEX']
+    jobs_module.fuzzy_search = app.config['FUZZY_SEARCH']
+    jobs_module.suggestions_enabled = app.config['JOB_SUGGESTIONS']
+    if app.config['JOB_INDEX'] or app.config['FUZZY_SEARCH'] or app.config['JOB_SUGGESTIONS']:
+        jobs_module.job_index = RowIndex(
+            app, db, jobs_module.job_serializer,
+            filters={
+                'program': ('program', ProgramType),
+                'state': ('state', None),
+                'type': ('type', JobType),
+                'status': ('status', JobStatus)
+            },
+            text_attrs=['title', 'description', 'organization', 'location'],
+            order_by=[('posted_date', True)],
+            suggest_attrs=jobs_module.SUGGEST_FIELDS if app.config['JOB_SUGGESTIONS'] else (),
+            reconcile_interval=app.config['JOB_INDEX_RECONCILE_INTERVAL']
+        )
+
+    providers_module.db = db
+    providers_module.ServiceProvider = ServiceProvider
+    providers_module.ExperienceLevel = ExperienceLevel
+    providers_module.ServiceStatus = ServiceStatus
+    providers_module.provider_serializer = RowSerializer(ServiceProvider, 'updated_at', cache_size=cache_size)
+
+    # In-memory provider index for match=fuzzy searches
+    providers_module.provider_index = None
+    if app.config['FUZZY_SEARCH']:
+        providers_module.provider_index = RowIndex(
+            app, db, providers_module.provider_serializer,
+            filters={
+                'program': ('programs', None),
+                'state': ('state', None),
+                'experience': ('experience_level', ExperienceLevel),
+                'status': ('status', ServiceStatus)
+            },
+            text_attrs=['name', 'bio', 'location'],
+            order_by=[('rating', True), ('name', False)],
+            reconcile_interval=app.config['JOB_INDEX_RECONCILE_INTERVAL']
+        )
+
+    scraper_module.db = db
+    scraper_module.Job = Job
+    scraper_module.ScrapeRun = ScrapeRun
+    scraper_module.ScrapeRunStatus = ScrapeRunStatus
+    scraper_module.load_job_scraper = load_job_scraper
+
+    app.register_blueprint(jobs_module.jobs_bp, url_prefix='/api/jobs')
+    app.register_blueprint(providers_module.providers_bp, url_prefix='/api/providers')
+    app.register_blueprint(scraper_module.scraper_bp, url_prefix='/api/scraper')
+
+def create_app(config=None):
+    """
+    Create and configure the Flask application
+
+    Args:
+        config: Optional mapping overriding the environment configuration
+
+    Returns:
+        Configured Flask app
+
+    Only one app per process is supported: route dependencies are injected
+    as module globals (see register_blueprints), and each app's query
+    cache and search indexes keep listening on the shared db.session after
+    the app is discarded. The test scripts create one app per test: a new
+    app leaves the earlier ones unusable, so only create it once the
+    previous one is done with.
+    """
+    app = Flask(__name__)
+    app.config.update(load_config())
+    if config:
+        app.config.update(config)
+
+    # Enable CORS for all routes
+    CORS(app, origins="*")
+
+    configure_database(app)
+
+    # Per-route latency, size, status and DB time at /metrics. Registered
+    # first so its after_request hook sees the final, compressed response
+    RequestMetrics(app, db)
+
+    # Compress responses with brotli (when installed) or gzip
+    ResponseCompressor(app)
+
+    # Cache serialized listings, invalidated whenever a commit writes their table
+    QueryCache(app, db)
+
+    # Separate time budgets for API and scraper routes
+    RequestDeadlines(app, db)
+
+    # Development/test only: query counts, N+1 and slow query logs, budgets
+    QueryTracker(app, db)
+
+    register_blueprints(app)
+
+    @app.route('/')
+    def index():
+        return {
+            'message': 'Cheer Guru Connect API',
+            'version': '2.0.0',
+            'endpoints': {
+                'jobs': '/api/jobs',
+                'providers': '/api/providers',
+                'scraper': '/api/scraper'
+            }
+        }
+
+    @app.route('/health')
+    def health_check():
+        return {'status': 'healthy', 'database': 'connected'}
+
+    return app
 
 if __name__ == '__main__':
+    app = create_app()
+
     with app.app_context():
         # Create all database tables
         db.create_all()
-    
+
     # Run the app
     app.run(host='0.0.0.0', port=5000, debug=True)
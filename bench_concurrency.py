@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Concurrency capacity benchmark: threaded vs gevent workers
+Holds many slow clients open against a single worker process while a
+probe measures whether normal API requests still get through
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+
+from bench_serving import BASE_DIR, seed, free_port
+
+PROBE_URL = '/api/jobs/stats'
+
+
+def start_server(use_async, port, env, threads):
+    """Launch one gunicorn worker through main.py and wait for /health"""
+    command = [sys.executable, os.path.join(BASE_DIR, 'main.py'), '--port', str(port),
+               '--workers', '1', '--threads', str(threads)]
+    if use_async:
+        command.append('--async')
+
+    server = subprocess.Popen(command, cwd=BASE_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1).read()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError('server did not start')
+
+
+def slow_client(port, stop, held):
+    """Trickle a request's headers one line at a time until told to stop"""
+    try:
+        sock = socket.create_connection(('127.0.0.1', port), timeout=5)
+    except OSError:
+        return
+    try:
+        sock.sendall(b'GET /api/jobs/ HTTP/1.1\r\nHost: localhost\r\n')
+        held.append(1)
+        while not stop.wait(1.0):
+            sock.sendall(b'X-Slow: 1\r\n')
+        sock.sendall(b'Connection: close\r\n\r\n')
+        sock.settimeout(30)
+        while sock.recv(65536):
+            pass
+    except OSError:
+        pass
+    finally:
+        sock.close()
+
+
+def probe(port, duration):
+    """Issue normal requests while the slow clients are connected"""
+    timings = []
+    failures = 0
+    ends = time.monotonic() + duration
+    while time.monotonic() < ends:
+        started = time.perf_counter()
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}{PROBE_URL}', timeout=2).read()
+            timings.append(time.perf_counter() - started)
+        except OSError:
+            failures += 1
+        time.sleep(0.05)
+    return sorted(timings), failures
+
+
+def run(use_async, env, slow_clients, threads, duration):
+    port = free_port()
+    server = start_server(use_async, port, env, threads)
+    stop = threading.Event()
+    held = []
+    try:
+        clients = [threading.Thread(target=slow_client, args=(port, stop, held), daemon=True)
+                   for _ in range(slow_clients)]
+        for client in clients:
+            client.start()
+        time.sleep(2)
+        timings, failures = probe(port, duration)
+        stop.set()
+        for client in clients:
+            client.join(timeout=10)
+    finally:
+        server.terminate()
+        server.wait()
+    return len(held), timings, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark slow-client capacity per worker process')
+    parser.add_argument('--jobs', type=int, default=500, help='Jobs in the database')
+    parser.add_argument('--slow-clients', type=int, default=200, help='Slow clients held open')
+    parser.add_argument('--threads', type=int, default=8, help='Threads of the threaded worker')
+    parser.add_argument('--duration', type=float, default=10.0, help='Probe seconds per server')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed(database_url, args.jobs)
+        env = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=os.pathsep.join(sys.path),
+                   GUNICORN_ACCESS_LOG='')
+
+        print("Cheer Guru Connect - Concurrency Capacity Benchmark")
+        print(f"1 worker process, {args.slow_clients} slow clients, probing {PROBE_URL} for {args.duration:.0f}s")
+        print("=" * 72)
+        print(f"  {'worker':<22} {'held':>6} {'probes ok':>10} {'failed':>7} {'p50':>9} {'p99':>9}")
+
+        for use_async, label in ((False, f'gthread x {args.threads}'), (True, 'gevent')):
+            held, timings, failures = run(use_async, env, args.slow_clients, args.threads, args.duration)
+            p50 = timings[len(timings) // 2] if timings else 0.0
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] if timings else 0.0
+            print(f"  {label:<22} {held:>6} {len(timings):>10} {failures:>7} {p50 * 1000:7.1f}ms {p99 * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Job index benchmark for filtered and searched job listings
+Answers the common FilterBar combinations from SQL and from the in-memory
+job index against growing tables and reports per-query latency
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Benchmark against a throwaway in-memory database
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from werkzeug.datastructures import MultiDict
+
+from app import create_app, db, Job, JobType, ProgramType, JobStatus
+import app.routes.jobs as jobs_module
+
+STATES = ['CA', 'TX', 'FL', 'OH', 'GA', 'NY', 'PA', 'NC']
+
+# FilterBar combinations and searches, most popular first
+HOT_QUERIES = [
+    'view=summary',
+    'view=summary&program=Cheerleading',
+    'view=summary&program=Cheerleading&state=CA',
+    'view=summary&search=coach',
+    'view=summary&state=TX&search=district 1',
+    'view=summary&program=Dance/Pom&status=Active',
+    'view=summary&type=Coaching&program=Cheerleading&search=sacramento',
+    'view=summary&status=Active&program=Cheerleading&state=FL'
+]
+
+
+def populate(start, count):
+    """Insert jobs start..start+count"""
+    now = datetime.utcnow()
+    job_types = list(JobType)
+    for i in range(start, start + count):
+        db.session.add(Job(
+            id=f"bench-{i}",
+            title=f"Varsity Cheerleading Coach {i}",
+            description="Lead practices, choreograph routines and supervise safe stunting. " * 5,
+            type=job_types[i % len(job_types)],
+            program=ProgramType.CHEERLEADING if i % 3 else ProgramType.DANCE_POM,
+            location="Sacramento" if i % 2 else "Austin",
+            state=STATES[i % len(STATES)],
+            organization=f"Unified School District {i % 40}",
+            posted_date=now - timedelta(hours=i),
+            status=JobStatus.ACTIVE,
+            source_site="EdJoin",
+            scraped_at=now,
+            last_updated=now
+        ))
+    db.session.commit()
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def sql_rows(args, projection):
+    return jobs_module._filtered_jobs_query(args).with_entities(*projection.columns).all()
+
+
+def index_rows(args, projection):
+    return jobs_module.job_index.query(args, projection)
+
+
+def replay(fetch, requests_count):
+    """Run requests_count listing queries, skewed towards the hot queries"""
+    rng = random.Random(42)
+    weights = [1 / (rank + 1) for rank in range(len(HOT_QUERIES))]
+    timings = []
+    for query in rng.choices(HOT_QUERIES, weights, k=requests_count):
+        args = MultiDict(pair.split('=', 1) for pair in query.split('&'))
+        projection = jobs_module.job_serializer.project_from_args(args)
+        started = time.perf_counter()
+        fetch(args, projection)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the in-memory job index')
+    parser.add_argument('--sizes', default='1000,5000,20000', help='Comma separated table sizes')
+    parser.add_argument('--requests', type=int, default=300, help='Listing queries per run')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    app = create_app({'JOB_INDEX': True})
+    job_index = jobs_module.job_index
+
+    with app.test_request_context():
+        db.create_all()
+
+        print("Cheer Guru Connect - Job Index Benchmark")
+        print(f"{args.requests} queries over {len(HOT_QUERIES)} filter and search combinations")
+        print("=" * 60)
+        print(f"  {'jobs':>7}  {'SQL p50':>9} {'p99':>9}   {'index p50':>9} {'p99':>9}   {'build':>8}")
+
+        total = 0
+        for size in sizes:
+            populate(total, size - total)
+            total = size
+
+            sql = replay(sql_rows, args.requests)
+
+            started = time.perf_counter()
+            job_index.invalidate()
+            job_index.version()
+            build = time.perf_counter() - started
+            indexed = replay(index_rows, args.requests)
+
+            print(f"  {size:>7}  {percentile(sql, 50) * 1000:7.2f}ms {percentile(sql, 99) * 1000:7.2f}ms"
+                  f"   {percentile(indexed, 50) * 1000:7.2f}ms {percentile(indexed, 99) * 1000:7.2f}ms"
+                  f"   {build * 1000:6.0f}ms")
+
+        print(f"\n  Index stats: {job_index.stats}")
+
+
+if __name__ == "__main__":
+    main()
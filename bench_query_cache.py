@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Query cache benchmark for filtered job listings
+Replays the common FilterBar combinations against growing tables and
+reports listing latency with and without the query result cache
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Benchmark against a throwaway in-memory database
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app import create_app, db, Job, JobType, ProgramType, JobStatus
+
+STATES = ['CA', 'TX', 'FL', 'OH', 'GA', 'NY', 'PA', 'NC']
+
+# FilterBar combinations, most popular first
+HOT_QUERIES = [
+    '',
+    'program=Cheerleading',
+    'program=Cheerleading&state=CA',
+    'program=Cheerleading&state=TX',
+    'state=CA',
+    'program=Dance/Pom',
+    'type=Coaching&program=Cheerleading',
+    'status=Active&program=Cheerleading&state=FL'
+]
+
+
+def populate(start, count):
+    """Insert jobs start..start+count"""
+    now = datetime.utcnow()
+    job_types = list(JobType)
+    for i in range(start, start + count):
+        db.session.add(Job(
+            id=f"bench-{i}",
+            title=f"Varsity Cheerleading Coach {i}",
+            description="Lead practices, choreograph routines and supervise safe stunting. " * 5,
+            type=job_types[i % len(job_types)],
+            program=ProgramType.CHEERLEADING if i % 3 else ProgramType.DANCE_POM,
+            location="Sacramento",
+            state=STATES[i % len(STATES)],
+            organization=f"Unified School District {i % 40}",
+            posted_date=now - timedelta(hours=i),
+            status=JobStatus.ACTIVE,
+            source_site="EdJoin",
+            scraped_at=now,
+            last_updated=now
+        ))
+    db.session.commit()
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def replay(client, requests_count):
+    """Issue requests_count listing requests, skewed towards the hot queries"""
+    rng = random.Random(42)
+    weights = [1 / (rank + 1) for rank in range(len(HOT_QUERIES))]
+    timings = []
+    for query in rng.choices(HOT_QUERIES, weights, k=requests_count):
+        started = time.perf_counter()
+        response = client.get(f'/api/jobs/?{query}')
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the job listing query cache')
+    parser.add_argument('--sizes', default='1000,5000,20000', help='Comma separated table sizes')
+    parser.add_argument('--requests', type=int, default=300, help='Listing requests per run')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    # A single process, so the in-process cache is safe to enable
+    app = create_app({'QUERY_CACHE_SIZE': 256})
+    query_cache = app.extensions['query_cache']
+
+    with app.app_context():
+        db.create_all()
+        client = app.test_client()
+
+        print("Cheer Guru Connect - Job Listing Query Cache Benchmark")
+        print(f"{args.requests} requests over {len(HOT_QUERIES)} filter combinations")
+        print("=" * 60)
+        print(f"  {'jobs':>7}  {'uncached p50':>12} {'p99':>9}   {'cached p50':>10} {'p99':>9}")
+
+        total = 0
+        for size in sizes:
+            populate(total, size - total)
+            total = size
+
+            query_cache.size = 0
+            uncached = replay(client, args.requests)
+
+            query_cache.size = app.config['QUERY_CACHE_SIZE']
+            query_cache.clear()
+            replay(client, len(HOT_QUERIES) * 4)
+            cached = replay(client, args.requests)
+
+            print(f"  {size:>7}  {percentile(uncached, 50) * 1000:10.2f}ms {percentile(uncached, 99) * 1000:7.2f}ms"
+                  f"   {percentile(cached, 50) * 1000:8.2f}ms {percentile(cached, 99) * 1000:7.2f}ms")
+
+        print(f"\n  Cache stats: {query_cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for the job scrapers
+Replays recorded fixtures through EdJoin and K12JobSpot so parsing and
+fetch pipeline regressions show up in a repeatable local run
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import logging
+import time
+
+import requests
+
+from app.services.edjoin_scraper import EdJoinScraper
+from app.services.k12jobspot_scraper import K12JobSpotScraper
+from app.services.scraper_fixtures import use_fixtures
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'scrapers')
+
+SCRAPERS = [
+    (EdJoinScraper, 'EdJoin', 'edjoin'),
+    (K12JobSpotScraper, 'K12JobSpot', 'k12jobspot')
+]
+
+
+def _search_url(scraper, keyword, page=1):
+    """Build the exact URL the scraper requests for a result page"""
+    params = {'keywords': keyword}
+    if isinstance(scraper, EdJoinScraper):
+        params['searchType'] = 'all'
+    else:
+        params.update({'location': '', 'locationRadius': '25'})
+    if page > 1:
+        params[scraper.page_param] = page
+    return requests.Request('GET', scraper.search_url, params=params).prepare().url
+
+
+def _edjoin_detail_page(posting_id, keyword):
+    return f"""<html><body>
+<h1>{keyword.title()} - Posting {posting_id}</h1>
+<a href="/Home/Jobs?districtID={posting_id % 50}">Unified School District {posting_id % 50}</a>
+<p>Sacramento, CA 95814</p>
+<div><span>Date Posted</span><span>08/01/2025</span></div>
+<div><span>Application Deadline</span><span>09/15/2025</span></div>
+<div><span>Salary</span><span>$3,500 stipend</span></div>
+<p>Contact: athletics{posting_id}@district.k12.ca.us (916) 555-0{posting_id % 1000:03d}</p>
+<div class="job-description">{'Lead the competitive and sideline squad, plan practices, choreograph routines and teach safe stunting. ' * 20}</div>
+<h3>Requirements</h3>
+<ul><li>CPR/First Aid</li><li>USA Cheer safety certification</li><li>Fingerprint clearance</li></ul>
+</body></html>"""
+
+
+def _k12jobspot_result_page(posting_ids, keyword):
+    listings = ''.join(
+        f"""<div class="job-listing"><a href="/job/{posting_id}">{keyword.title()} {posting_id}</a>
+<span>Lincoln High School</span><span>Austin, TX</span><span>{posting_id % 9 + 1} days ago</span></div>"""
+        for posting_id in posting_ids
+    )
+    return f"<html><body>{listings}</body></html>"
+
+
+def generate_synthetic_fixtures(fixture_dir, postings_per_keyword=10, pages=2):
+    """
+    Write synthetic result and detail pages for every keyword query
+
+    Used when no live recording is available; the markup follows the
+    structures the scrapers already parse.
+    """
+    for scraper_class, name, slug in SCRAPERS:
+        scraper = scraper_class()
+        adapter = use_fixtures(scraper, os.path.join(fixture_dir, slug), mode='replay')
+        posting_id = 100000
+        per_page = max(1, postings_per_keyword // pages)
+
+        for keyword in scraper.get_search_queries() + scraper.get_search_queries(batched=True):
+            for page in range(1, pages + 2):
+                # The page past the last one lists nothing, ending pagination
+                ids = list(range(posting_id, posting_id + per_page)) if page <= pages else []
+                posting_id += len(ids)
+
+                if slug == 'edjoin':
+                    links = ''.join(f'<a href="/Home/JobPosting/{i}">{keyword.title()} {i}</a>' for i in ids)
+                    adapter.save_fixture(_search_url(scraper, keyword, page), f"<html><body>{links}</body></html>")
+                    for i in ids:
+                        adapter.save_fixture(f"{scraper.base_url}/Home/JobPosting/{i}", _edjoin_detail_page(i, keyword))
+                else:
+                    adapter.save_fixture(_search_url(scraper, keyword, page), _k12jobspot_result_page(ids, keyword))
+
+        print(f"Generated synthetic fixtures for {name} in {adapter.fixture_dir}")
+
+
+def bench_scraper(scraper_class, name, fixture_dir, mode, latency, max_per_keyword, repeat, batched):
+    """Run full sweeps against the fixtures and collect throughput numbers"""
+    runs = []
+
+    for _ in range(repeat):
+        scraper = scraper_class()
+        scraper.logger.setLevel(logging.WARNING)
+        adapter = use_fixtures(scraper, fixture_dir, mode=mode, latency=latency)
+
+        started = time.perf_counter()
+        jobs = list(scraper.iter_cheerleading_jobs(max_per_keyword, batched=batched))
+        sweep_seconds = time.perf_counter() - started
+
+        pages = adapter.stats['requests'] - adapter.stats['misses']
+        parse_seconds = max(sweep_seconds - adapter.stats['fetch_seconds'], 0.0)
+        runs.append({
+            'jobs': len(jobs),
+            'pages': pages,
+            'search_requests': scraper.search_requests,
+            'bytes': adapter.stats['bytes'],
+            'misses': adapter.stats['misses'],
+            'sweep_seconds': sweep_seconds,
+            'pages_per_second': pages / sweep_seconds if sweep_seconds else 0.0,
+            'parse_ms_per_page': parse_seconds * 1000 / pages if pages else 0.0,
+            'telemetry': scraper.telemetry.to_dict()
+        })
+
+    best = min(runs, key=lambda run: run['sweep_seconds'])
+
+    print(f"\n{name}")
+    print(f"  Jobs scraped:       {best['jobs']}")
+    print(f"  Pages fetched:      {best['pages']} ({best['search_requests']} search, {best['misses']} missing fixtures)")
+    print(f"  Bytes:              {best['bytes']:,}")
+    print(f"  Sweep time:         {best['sweep_seconds'] * 1000:.1f} ms (best of {repeat})")
+    print(f"  Pages/sec:          {best['pages_per_second']:.1f}")
+    print(f"  Parse ms/page:      {best['parse_ms_per_page']:.2f}")
+    split = ', '.join(f"{phase} {seconds * 1000:.0f}" for phase, seconds in best['telemetry']['seconds'].items())
+    print(f"  Time split (ms):    {split}")
+    rates = best['telemetry']['field_hit_rates']
+    print(f"  Field hit rates:    {', '.join(f'{field} {rate:.0%}' for field, rate in rates.items() if rate is not None)}")
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the job scrapers against recorded fixtures')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='Fixture directory')
+    parser.add_argument('--record', action='store_true', help='Record fixtures from the live sites first')
+    parser.add_argument('--synthetic', type=int, metavar='N',
+                        help='Generate synthetic fixtures with N postings per keyword first')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated latency per request in seconds')
+    parser.add_argument('--max-per-keyword', type=int, default=10, help='Maximum jobs per keyword')
+    parser.add_argument('--repeat', type=int, default=3, help='Sweeps per scraper')
+    parser.add_argument('--batched', action='store_true', help='Benchmark batched keyword queries')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        generate_synthetic_fixtures(args.fixtures, postings_per_keyword=args.synthetic)
+
+    print("Cheer Guru Connect - Scraper Throughput Benchmark")
+    print(f"Mode: {'record' if args.record else 'replay'}, latency: {args.latency * 1000:.0f} ms, "
+          f"{'batched' if args.batched else 'per-keyword'} queries")
+    print("=" * 60)
+
+    for scraper_class, name, slug in SCRAPERS:
+        fixture_dir = os.path.join(args.fixtures, slug)
+        if args.record:
+            # Record once at the site's pace; the timings below are then replayed
+            bench_scraper(scraper_class, name, fixture_dir, 'record', 0.0,
+                          args.max_per_keyword, 1, args.batched)
+        bench_scraper(scraper_class, name, fixture_dir, 'replay', args.latency,
+                      args.max_per_keyword, args.repeat, args.batched)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for job list responses
+Compares to_dict() + jsonify against the projected RowSerializer path
+on an in-memory database
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Benchmark against a throwaway in-memory database
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from app import create_app, db, Job, JobType, ProgramType, JobStatus
+from app.services.serializers import RowSerializer, orjson
+
+
+def populate(count):
+    """Insert count jobs with realistic description sizes"""
+    now = datetime.utcnow()
+    job_types = list(JobType)
+    for i in range(count):
+        db.session.add(Job(
+            id=f"bench-{i}",
+            title=f"Varsity Cheerleading Coach {i}",
+            description="Lead practices, choreograph routines and supervise safe stunting. " * 15,
+            type=job_types[i % len(job_types)],
+            program=ProgramType.CHEERLEADING if i % 3 else ProgramType.DANCE_POM,
+            location="Sacramento, CA",
+            state="CA",
+            organization=f"Unified School District {i % 40}",
+            requirements="CPR/First Aid; USA Cheer safety certification; Fingerprint clearance",
+            compensation="$3,500 stipend",
+            contact_email="athletics@district.k12.ca.us",
+            posted_date=now - timedelta(hours=i),
+            deadline=now + timedelta(days=30),
+            status=JobStatus.ACTIVE,
+            source_url=f"https://www.edjoin.org/Home/JobPosting/{i}",
+            source_site="EdJoin",
+            scraped_at=now,
+            last_updated=now
+        ))
+    db.session.commit()
+
+
+def measure(label, func, repeat):
+    """Time func and record its peak allocation"""
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        body = func()
+        timings.append(time.perf_counter() - started)
+
+    db.session.expunge_all()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    print(f"  {label:<32} {best * 1000:8.1f} ms   peak {peak / 1024 / 1024:6.1f} MiB   {len(body):,} bytes")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark job list serialization')
+    parser.add_argument('--jobs', type=int, default=5000, help='Number of jobs to serialize')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per variant')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        populate(args.jobs)
+
+        serializer = RowSerializer(Job, 'last_updated', cache_size=args.jobs)
+        uncached = RowSerializer(Job, 'last_updated')
+
+        def baseline():
+            jobs = Job.query.order_by(Job.posted_date.desc()).all()
+            return app.json.dumps({
+                'success': True,
+                'jobs': [job.to_dict() for job in jobs],
+                'count': len(jobs)
+            }).encode('utf-8')
+
+        def projected(row_serializer):
+            rows = Job.query.order_by(Job.posted_date.desc()) \
+                .with_entities(*row_serializer.columns).all()
+            return row_serializer.encode_list(rows, 'jobs')
+
+        print("Cheer Guru Connect - Job List Serialization Benchmark")
+        print(f"{args.jobs} jobs, best of {args.repeat}, encoder: {'orjson' if orjson else 'json'}")
+        print("=" * 60)
+
+        base = measure("to_dict + jsonify", baseline, args.repeat)
+        fast = measure("projection, no row cache", lambda: projected(uncached), args.repeat)
+        projected(serializer)
+        cached = measure("projection, warm row cache", lambda: projected(serializer), args.repeat)
+
+        print(f"\n  Speedup: {base / fast:.1f}x uncached, {base / cached:.1f}x with warm row cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Serving benchmark: gunicorn production mode vs the Flask development server
+Starts each server through main.py against a seeded SQLite file, then
+drives it with concurrent HTTP clients and reports throughput and latency
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import random
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STATES = ['CA', 'TX', 'FL', 'OH', 'GA', 'NY', 'PA', 'NC']
+
+QUERIES = [
+    '/api/jobs/',
+    '/api/jobs/?program=Cheerleading',
+    '/api/jobs/?state=CA',
+    '/api/jobs/?view=summary',
+    '/api/jobs/stats',
+    '/api/providers/'
+]
+
+
+def seed(database_url, count):
+    """Create the schema and insert count jobs"""
+    from app import create_app, db, Job, JobType, ProgramType, JobStatus
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_url})
+    now = datetime.utcnow()
+    job_types = list(JobType)
+    with app.app_context():
+        db.create_all()
+        for i in range(count):
+            db.session.add(Job(
+                id=f"bench-{i}",
+                title=f"Varsity Cheerleading Coach {i}",
+                description="Lead practices, choreograph routines and supervise safe stunting. " * 5,
+                type=job_types[i % len(job_types)],
+                program=ProgramType.CHEERLEADING if i % 3 else ProgramType.DANCE_POM,
+                location="Sacramento",
+                state=STATES[i % len(STATES)],
+                organization=f"Unified School District {i % 40}",
+                posted_date=now - timedelta(hours=i),
+                status=JobStatus.ACTIVE,
+                source_site="EdJoin",
+                scraped_at=now,
+                last_updated=now
+            ))
+        db.session.commit()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port, env, workers, threads):
+    """Launch main.py and wait until /health answers"""
+    command = [sys.executable, os.path.join(BASE_DIR, 'main.py'), '--port', str(port)]
+    if mode == 'dev':
+        command.append('--dev')
+    else:
+        command += ['--workers', str(workers), '--threads', str(threads)]
+
+    server = subprocess.Popen(command, cwd=BASE_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1).read()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f'{mode} server did not start')
+
+
+def load(port, clients, duration):
+    """Run concurrent clients for duration seconds and collect latencies"""
+    stop = threading.Event()
+    timings = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def client(n):
+        rng = random.Random(n)
+        local = []
+        while not stop.is_set():
+            url = f'http://127.0.0.1:{port}{rng.choice(QUERIES)}'
+            started = time.perf_counter()
+            try:
+                urllib.request.urlopen(url, timeout=30).read()
+                local.append(time.perf_counter() - started)
+            except OSError:
+                errors[0] += 1
+        with lock:
+            timings.extend(local)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sorted(timings), errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark production serving against the dev server')
+    parser.add_argument('--jobs', type=int, default=2000, help='Jobs in the database')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent HTTP clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per server')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the query result cache')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed(database_url, args.jobs)
+
+        env = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=os.pathsep.join(sys.path),
+                   GUNICORN_ACCESS_LOG='')
+        if args.no_cache:
+            env['QUERY_CACHE_SIZE'] = '0'
+
+        print("Cheer Guru Connect - Serving Benchmark")
+        print(f"{args.jobs} jobs, {args.clients} concurrent clients, {args.duration:.0f}s per server, "
+              f"query cache {'off' if args.no_cache else 'on'}")
+        print("=" * 72)
+        print(f"  {'server':<28} {'req/s':>8} {'p50':>9} {'p99':>9}  errors")
+
+        for mode, label in (('dev', 'Flask dev server'),
+                            ('prod', f'gunicorn {args.workers}w x {args.threads}t')):
+            port = free_port()
+            server = start_server(mode, port, env, args.workers, args.threads)
+            try:
+                timings, errors = load(port, args.clients, args.duration)
+            finally:
+                server.terminate()
+                server.wait()
+
+            p50 = timings[len(timings) // 2] if timings else 0.0
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] if timings else 0.0
+            print(f"  {label:<28} {len(timings) / args.duration:8.0f} {p50 * 1000:7.1f}ms {p99 * 1000:7.1f}ms  {errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write load test for the SQLite production profile
+Runs listing reads from several threads while a separate process ingests
+jobs the way the scraper does, against a temporary database file with
+and without the profile
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# The app itself runs against a throwaway in-memory database
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+import argparse
+import multiprocessing
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select, insert
+from sqlalchemy.exc import OperationalError
+
+from app import db, Job, JobType, ProgramType, JobStatus
+from app.services.sqlite_profile import sqlite_engine_options, apply_sqlite_pragmas
+
+STATES = ['CA', 'TX', 'FL', 'OH', 'GA', 'NY', 'PA', 'NC']
+
+
+def job_row(i):
+    now = datetime.utcnow()
+    return {
+        'id': f"load-{i}",
+        'title': f"Varsity Cheerleading Coach {i}",
+        'description': "Lead practices, choreograph routines and supervise safe stunting. " * 5,
+        'type': list(JobType)[i % len(JobType)],
+        'program': ProgramType.CHEERLEADING,
+        'location': "Sacramento",
+        'state': STATES[i % len(STATES)],
+        'organization': f"Unified School District {i % 40}",
+        'posted_date': now - timedelta(hours=i),
+        'status': JobStatus.ACTIVE,
+        'source_site': "EdJoin",
+        'scraped_at': now,
+        'last_updated': now
+    }
+
+
+def make_engine(path, profile):
+    url = f"sqlite:///{path}"
+    if not profile:
+        return create_engine(url)
+    engine = create_engine(url, **sqlite_engine_options(url))
+    apply_sqlite_pragmas(engine)
+    return engine
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+def writer(path, profile, start, batch, stop, written, errors):
+    """Scrape ingest in its own process: insert a page of jobs, commit, repeat"""
+    engine = make_engine(path, profile)
+    table = Job.__table__
+    i = start
+    while not stop.is_set():
+        try:
+            with engine.begin() as conn:
+                for _ in range(batch):
+                    conn.execute(insert(table), job_row(i))
+                    i += 1
+                    time.sleep(0.001)
+            written.value += batch
+        except OperationalError:
+            errors.value += 1
+    engine.dispose()
+
+
+def run(profile, seed_rows, readers, duration, batch):
+    """Run one mixed load test and return its measurements"""
+    table = Job.__table__
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'load.db')
+        engine = make_engine(path, profile)
+        db.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(table), [job_row(i) for i in range(seed_rows)])
+
+        stop = threading.Event()
+        read_timings = []
+        errors = {'read': 0, 'write': 0}
+        lock = threading.Lock()
+
+        def reader(n):
+            query = select(table).where(table.c.state == STATES[n % len(STATES)]) \
+                .order_by(table.c.posted_date.desc())
+            timings = []
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    with engine.connect() as conn:
+                        conn.execute(query).fetchall()
+                except OperationalError:
+                    errors['read'] += 1
+                timings.append(time.perf_counter() - started)
+            with lock:
+                read_timings.extend(timings)
+
+        engine.dispose()
+        writer_stop = multiprocessing.Event()
+        written = multiprocessing.Value('i', 0)
+        write_errors = multiprocessing.Value('i', 0)
+        ingest = multiprocessing.Process(
+            target=writer,
+            args=(path, profile, seed_rows, batch, writer_stop, written, write_errors)
+        )
+
+        threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+        ingest.start()
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        writer_stop.set()
+        for thread in threads:
+            thread.join()
+        ingest.join()
+        engine.dispose()
+        errors['write'] = write_errors.value
+
+    return {
+        'reads': len(read_timings) / duration,
+        'writes': written.value / duration,
+        'p50': percentile(read_timings, 50),
+        'p99': percentile(read_timings, 99),
+        'max': max(read_timings) if read_timings else 0.0,
+        'errors': errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mixed read/write SQLite load test')
+    parser.add_argument('--rows', type=int, default=5000, help='Jobs in the table before the run')
+    parser.add_argument('--readers', type=int, default=4, help='Concurrent reader threads')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per run')
+    parser.add_argument('--batch', type=int, default=25, help='Jobs inserted per write transaction')
+    args = parser.parse_args()
+
+    print("Cheer Guru Connect - SQLite Mixed Load Test")
+    print(f"{args.rows} jobs, {args.readers} reader threads + 1 ingest process, {args.duration:.0f}s per run")
+    print("=" * 72)
+    print(f"  {'profile':<10} {'reads/s':>8} {'writes/s':>9} {'read p50':>9} {'p99':>9} {'max':>9}  errors")
+
+    for label, profile in (('default', False), ('wal', True)):
+        result = run(profile, args.rows, args.readers, args.duration, args.batch)
+        print(f"  {label:<10} {result['reads']:8.0f} {result['writes']:9.0f} "
+              f"{result['p50'] * 1000:7.1f}ms {result['p99'] * 1000:7.1f}ms {result['max'] * 1000:7.1f}ms  "
+              f"{result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for API workers
+Measures cold start time, peak memory and loaded modules of a fresh
+process creating the app, with and without the scraper stack imported
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import json
+import subprocess
+
+# Runs in a fresh interpreter per measurement
+CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import app
+flask_app = app.create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+if %(scraper)r:
+    app.load_job_scraper()
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'seconds': elapsed,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+    'scraper_stack': 'bs4' in sys.modules or 'requests' in sys.modules
+}))
+"""
+
+SCENARIOS = [
+    ('API only', False),
+    ('API + scraper stack', True)
+]
+
+
+def measure(scraper):
+    """Start a fresh interpreter and return its startup measurements"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD % {'scraper': scraper}],
+        capture_output=True, text=True, env=env, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark API worker startup')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh processes per scenario')
+    args = parser.parse_args()
+
+    print("Cheer Guru Connect - API Worker Startup Benchmark")
+    print(f"Best of {args.repeat} fresh processes per scenario")
+    print("=" * 60)
+    print(f"  {'scenario':<22} {'startup':>9} {'peak RSS':>10} {'modules':>8}  scraper stack")
+
+    results = {}
+    for label, scraper in SCENARIOS:
+        runs = [measure(scraper) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run['seconds'])
+        results[label] = best
+        print(f"  {label:<22} {best['seconds'] * 1000:7.0f}ms {best['max_rss_kb'] / 1024:8.1f}MiB "
+              f"{best['modules']:8d}  {'loaded' if best['scraper_stack'] else 'not loaded'}")
+
+    api, full = results['API only'], results['API + scraper stack']
+    print(f"\n  API-only workers save {(full['seconds'] - api['seconds']) * 1000:.0f}ms and "
+          f"{(full['max_rss_kb'] - api['max_rss_kb']) / 1024:.1f}MiB per process")
+
+
+if __name__ == "__main__":
+    main()
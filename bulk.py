@@ -0,0 +1,83 @@
+from flask import jsonify
+
+# Largest batch accepted per request, and rows written per transaction
+BULK_MAX_ITEMS = 5000
+BULK_CHUNK_SIZE = 500
+
+
+def get_bulk_items(data, key):
+    """
+    Pull the item list out of a bulk request body
+
+    Returns:
+        Tuple of (items, error message); items is None when invalid
+    """
+    items = (data or {}).get(key) if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, f'Request body must contain a non-empty "{key}" list'
+    if len(items) > BULK_MAX_ITEMS:
+        return None, f'At most {BULK_MAX_ITEMS} items can be sent per request'
+    return items, None
+
+
+def chunks(items, size=BULK_CHUNK_SIZE):
+    """Split a list into consecutive chunks"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def existing_ids(session, model, ids):
+    """Return which of the given primary keys already exist, querying in chunks"""
+    found = set()
+    for chunk in chunks(list(ids)):
+        found.update(row[0] for row in session.query(model.id).filter(model.id.in_(chunk)))
+    return found
+
+
+def write_in_chunks(session, items, apply_chunk):
+    """
+    Write validated items in one transaction per chunk
+
+    Args:
+        session: Database session
+        items: List of (index, payload) tuples that passed validation
+        apply_chunk: Callable applying a chunk of (index, payload) tuples
+            to the session
+
+    Returns:
+        Dictionary of index -> error message for items whose chunk failed
+    """
+    failures = {}
+    for chunk in chunks(items):
+        try:
+            apply_chunk(chunk)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            for index, _ in chunk:
+                failures[index] = f'Write failed: {e}'
+    return failures
+
+
+def item_result(index, item_id, errors=None):
+    """Per-item result entry of a bulk response"""
+    result = {'index': index, 'id': item_id, 'success': not errors}
+    if errors:
+        result['errors'] = errors
+    return result
+
+
+def bulk_response(results, message):
+    """
+    Build the bulk response: 200 when every item succeeded, otherwise
+    207 Multi-Status with the per-item errors
+    """
+    failed = sum(1 for result in results if not result['success'])
+    response = jsonify({
+        'success': failed == 0,
+        'results': results,
+        'succeeded': len(results) - failed,
+        'failed': failed,
+        'message': message
+    })
+    return response, 200 if failed == 0 else 207
@@ -0,0 +1,106 @@
+import gzip
+import threading
+from collections import OrderedDict
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+class ResponseCompressor:
+    """
+    Compresses responses with brotli or gzip, negotiated via Accept-Encoding
+
+    Responses that carry an ETag (see app.services.http_cache) are cached
+    compressed, keyed by ETag and encoding. Since the ETag already covers
+    the endpoint, query parameters and data version, each hot listing is
+    compressed once per data version rather than once per request.
+    """
+
+    COMPRESSIBLE_MIMETYPES = {
+        'application/json',
+        'application/x-ndjson',
+        'text/csv',
+        'text/html',
+        'text/plain'
+    }
+
+    def __init__(self, app=None):
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESSION_MIN_SIZE', 500)
+        app.config.setdefault('COMPRESSION_GZIP_LEVEL', 6)
+        app.config.setdefault('COMPRESSION_BROTLI_QUALITY', 5)
+        app.config.setdefault('COMPRESSION_CACHE_SIZE', 32)
+
+        self.min_size = app.config['COMPRESSION_MIN_SIZE']
+        self.gzip_level = app.config['COMPRESSION_GZIP_LEVEL']
+        self.brotli_quality = app.config['COMPRESSION_BROTLI_QUALITY']
+        self.cache_size = app.config['COMPRESSION_CACHE_SIZE']
+
+        # Preferred encodings first
+        self.encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+        app.after_request(self.compress_response)
+
+    def compress(self, body, encoding):
+        """Compress a response body with the given content coding"""
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    def compress_response(self, response):
+        """after_request hook compressing eligible responses"""
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in self.COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        encoding = request.accept_encodings.best_match(self.encodings)
+        if not encoding:
+            return response
+
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+
+        etag, _ = response.get_etag()
+        key = (etag, encoding) if etag else None
+
+        compressed = self._cache_get(key)
+        if compressed is None:
+            compressed = self.compress(body, encoding)
+            self._cache_put(key, compressed)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _cache_get(self, key):
+        if key is None or not self.cache_size:
+            return None
+        with self._lock:
+            compressed = self._cache.get(key)
+            if compressed is not None:
+                self._cache.move_to_end(key)
+            return compressed
+
+    def _cache_put(self, key, compressed):
+        if key is None or not self.cache_size:
+            return
+        with self._lock:
+            self._cache[key] = compressed
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
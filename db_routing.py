@@ -0,0 +1,74 @@
+"""
+Read/write routing between the primary database and a read replica
+
+When DATABASE_REPLICA_URL is set, app.py registers it as the 'replica'
+bind and builds db.session from RoutingSession:
+
+* SELECTs issued while serving a GET or HEAD request (listings, detail,
+  stats, exports) go to the replica.
+* Everything else goes to the primary: flushes, Query.update/delete,
+  every query in a mutating request, and any work outside a request such
+  as scheduled JobScraper ingestion.
+* Read-your-writes: once a session has written anything, its later reads
+  use the primary too, so a route never reads back stale rows after its
+  own commit. use_primary() forces the same for a block of code.
+
+Replicas lag the primary, so a GET right after another request's write
+can briefly see the old data (and the query cache may hold it for up to
+QUERY_CACHE_TTL).
+"""
+
+from contextlib import contextmanager
+
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = 'replica'
+
+# Requests whose reads may be served by the replica
+READ_METHODS = ('GET', 'HEAD')
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends read-only queries to the replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        if (self._flushing
+                or self.info.get('wrote')
+                or self.info.get('use_primary')
+                or clause is None
+                or not getattr(clause, 'is_select', False)):
+            return False
+        return has_request_context() and request.method in READ_METHODS
+
+
+def track_writes(session):
+    """Mark sessions that write so their later reads stay on the primary"""
+    @event.listens_for(session, 'before_flush')
+    def mark_flush(session, flush_context, instances):
+        if session.new or session.dirty or session.deleted:
+            session.info['wrote'] = True
+
+    @event.listens_for(session, 'do_orm_execute')
+    def mark_bulk_write(orm_execute_state):
+        if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+            orm_execute_state.session.info['wrote'] = True
+
+
+@contextmanager
+def use_primary(session):
+    """Route every query of a session to the primary inside the block"""
+    previous = session.info.get('use_primary')
+    session.info['use_primary'] = True
+    try:
+        yield session
+    finally:
+        session.info['use_primary'] = previous
@@ -7,6 +7,9 @@ from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse, parse_qs
 import logging
 
+from app.services.job_classifier import classify_job
+from app.services.scrape_telemetry import ScrapeTelemetry
+
 class EdJoinScraper:
     """
     Scraper for EdJoin.org education job board
@@ -43,9 +46,31 @@ class EdJoinScraper:
             'pom coach'
         ]
         
+        # Batched search: keywords are OR-ed into as few search requests as
+        # the query length allows (or replaced by one broad query when OR is
+        # unsupported), and results are filtered locally against these terms
+        self.supports_or_queries = True
+        self.max_query_length = 200
+        self.broad_query = 'coach'
+        self.keyword_filter_terms = ['cheer', 'spirit', 'pep squad', 'dance', 'dancer', 'pom']
+        # Whole words, plus plurals and cheerleader/cheerleading, so 'dance'
+        # does not match "Attendance" nor 'pom' the Pomona districts
+        self.keyword_filter = re.compile(
+            r'\b(?:' + '|'.join(re.escape(term) for term in self.keyword_filter_terms) + r')(?:s|leaders?|leading)?\b'
+        )
+        self.search_requests = 0
+        
+        # Result pagination: pages are read lazily until enough candidates
+        # are found or a page brings nothing new
+        self.page_param = 'page'
+        self.max_pages = 20
+        
         # Set up logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
+        
+        # Timing, traffic and extraction counters for the current run
+        self.telemetry = ScrapeTelemetry()
     
     def _rate_limit(self):
         """Implement rate limiting between requests"""
@@ -53,32 +78,66 @@ class EdJoinScraper:
         time_since_last = current_time - self.last_request_time
         if time_since_last < self.request_delay:
             sleep_time = self.request_delay - time_since_last
-            time.sleep(sleep_time)
+            with self.telemetry.timer('sleep'):
+                time.sleep(sleep_time)
         self.last_request_time = time.time()
     
     def _make_request(self, url, params=None):
         """Make a rate-limited HTTP request"""
         self._rate_limit()
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            with self.telemetry.timer('fetch'):
+                response = self.session.get(url, params=params, timeout=10)
+            self.telemetry.record_response(response)
             response.raise_for_status()
             return response
+        except requests.HTTPError as e:
+            self.logger.error(f"Request failed for {url}: {e}")
+            return None
         except requests.RequestException as e:
+            self.telemetry.record_failure()
             self.logger.error(f"Request failed for {url}: {e}")
             return None
     
-    def search_jobs(self, keyword, max_results=50):
+    def search_jobs(self, keyword, max_results=50, skip_ids=None):
         """
         Search for jobs on EdJoin with a specific keyword
         
         Args:
             keyword: Search term (e.g., 'cheerleading coach')
             max_results: Maximum number of jobs to return
+            skip_ids: Job IDs whose detail pages should not be fetched
             
         Returns:
             List of job dictionaries
         """
-        jobs = []
+        jobs = list(self.iter_search_jobs(keyword, max_results, skip_ids))
+        self.logger.info(f"Found {len(jobs)} jobs for keyword: {keyword}")
+        return jobs
+    
+    def iter_search_jobs(self, keyword, max_results=50, skip_ids=None, local_filter=False,
+                         start_page=1, on_page=None):
+        """
+        Lazily search for jobs on EdJoin, yielding each job as soon as its
+        detail page has been scraped
+        
+        Result pages are only fetched while more candidates are needed, and
+        iteration stops once max_results unique postings have been seen or a
+        page lists nothing that earlier pages did not.
+        
+        Args:
+            keyword: Search term (e.g., 'cheerleading coach')
+            max_results: Maximum number of unique postings to consider
+            skip_ids: Job IDs whose detail pages should not be fetched
+            local_filter: Drop jobs that do not match keyword_filter
+            start_page: Result page to start from
+            on_page: Optional callback receiving each result page number
+            
+        Yields:
+            Job dictionaries
+        """
+        skip_ids = skip_ids or set()
+        seen_ids = set()
         
         # Search parameters
         search_params = {
@@ -88,24 +147,118 @@ class EdJoinScraper:
         
         self.logger.info(f"Searching EdJoin for: {keyword}")
         
-        response = self._make_request(self.search_url, params=search_params)
-        if not response:
-            return jobs
+        for page, soup in self._iter_result_pages(search_params, start_page, on_page):
+            # Find job listings - this is a simplified approach
+            # In reality, EdJoin likely uses JavaScript for dynamic loading
+            with self.telemetry.timer('parse'):
+                job_links = soup.find_all('a', href=re.compile(r'/Home/JobPosting/\d+'))
+                
+                candidates = []
+                for link in job_links:
+                    if len(seen_ids) >= max_results:
+                        break
+                    job_url = urljoin(self.base_url, link.get('href'))
+                    job_id = self._generate_job_id(job_url)
+                    if job_id not in seen_ids:
+                        seen_ids.add(job_id)
+                        candidates.append((job_id, job_url))
+            
+            if not candidates:
+                self.logger.info(f"No new postings on page {page} for: {keyword}")
+                return
+            
+            for job_id, job_url in candidates:
+                if job_id in skip_ids:
+                    self.telemetry.skipped_postings += 1
+                    continue
+                job_data = self._scrape_job_details(job_url)
+                if job_data and (not local_filter or self._matches_keywords(job_data)):
+                    yield job_data
+            
+            if len(seen_ids) >= max_results:
+                return
+    
+    def _iter_result_pages(self, search_params, start_page=1, on_page=None):
+        """
+        Lazily fetch search result pages, following the next-page link when
+        the page has one and falling back to the page offset parameter
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        Args:
+            search_params: Query parameters for the first result page
+            start_page: Result page to start from
+            on_page: Optional callback receiving each page number before
+                it is fetched
+            
+        Yields:
+            Tuples of (page number, BeautifulSoup of the result page)
+        """
+        url = self.search_url
+        params = dict(search_params)
+        if start_page > 1:
+            params[self.page_param] = start_page
+        
+        for page in range(start_page, start_page + self.max_pages):
+            if on_page:
+                on_page(page)
+            
+            self.search_requests += 1
+            response = self._make_request(url, params=params)
+            if not response:
+                return
+            
+            with self.telemetry.timer('parse'):
+                soup = BeautifulSoup(response.content, 'html.parser')
+            yield page, soup
+            
+            next_href = self._find_next_page_link(soup)
+            if next_href:
+                url = urljoin(response.url, next_href)
+                params = None
+            else:
+                url = self.search_url
+                params = dict(search_params)
+                params[self.page_param] = page + 1
+    
+    def _find_next_page_link(self, soup):
+        """Find the href of the next result page, if the page links to one"""
+        link = soup.find('a', rel='next') or soup.find('a', string=re.compile(r'^\s*(Next|›|»)', re.IGNORECASE))
+        if link and link.get('href'):
+            return link.get('href')
+        return None
+    
+    def get_search_queries(self, batched=False):
+        """
+        Get the search queries a sweep will run
         
-        # Find job listings - this is a simplified approach
-        # In reality, EdJoin likely uses JavaScript for dynamic loading
-        job_links = soup.find_all('a', href=re.compile(r'/Home/JobPosting/\d+'))
+        Args:
+            batched: Combine keywords into as few queries as possible
+            
+        Returns:
+            List of query strings
+        """
+        if not batched:
+            return list(self.cheerleading_keywords)
         
-        for link in job_links[:max_results]:
-            job_url = urljoin(self.base_url, link.get('href'))
-            job_data = self._scrape_job_details(job_url)
-            if job_data:
-                jobs.append(job_data)
+        if not self.supports_or_queries:
+            return [self.broad_query]
         
-        self.logger.info(f"Found {len(jobs)} jobs for keyword: {keyword}")
-        return jobs
+        queries = []
+        current = []
+        for keyword in self.cheerleading_keywords:
+            candidate = current + [f'"{keyword}"']
+            if current and len(' OR '.join(candidate)) > self.max_query_length:
+                queries.append(' OR '.join(current))
+                candidate = [f'"{keyword}"']
+            current = candidate
+        if current:
+            queries.append(' OR '.join(current))
+        
+        return queries
+    
+    def _matches_keywords(self, job_data):
+        """Check a job's title and description against the local keyword filter"""
+        text = f"{job_data.get('title', '')} {job_data.get('description', '')}".lower()
+        return self.keyword_filter.search(text) is not None
     
     def _scrape_job_details(self, job_url):
         """
@@ -121,6 +274,14 @@ class EdJoinScraper:
         if not response:
             return None
         
+        with self.telemetry.timer('parse'):
+            job_data = self._parse_job_details(job_url, response)
+        if job_data:
+            self.telemetry.record_fields(job_data)
+        return job_data
+    
+    def _parse_job_details(self, job_url, response):
+        """Extract the job dictionary from a fetched posting page"""
         soup = BeautifulSoup(response.content, 'html.parser')
         
         try:
@@ -180,8 +341,9 @@ class EdJoinScraper:
                 job_data['requirements'] = requirements
             
             # Determine job type and program from title and description
-            job_data['type'] = self._classify_job_type(job_data.get('title', ''), job_data.get('description', ''))
-            job_data['program'] = self._classify_program_type(job_data.get('title', ''), job_data.get('description', ''))
+            classification = classify_job(job_data.get('title', ''), job_data.get('description', ''))
+            job_data['type'] = classification['type']['value']
+            job_data['program'] = classification['program']['value']
             
             # Set status
             job_data['status'] = 'Active'  # Assume active if we found it
@@ -295,29 +457,11 @@ class EdJoinScraper:
     
     def _classify_job_type(self, title, description):
         """Classify the job type based on title and description"""
-        text = f"{title} {description}".lower()
-        
-        if any(word in text for word in ['coach', 'coaching']):
-            return 'Coaching'
-        elif any(word in text for word in ['choreograph', 'choreography']):
-            return 'Choreography'
-        elif any(word in text for word in ['judge', 'judging', 'official']):
-            return 'Judging'
-        elif any(word in text for word in ['instructor', 'training', 'teach']):
-            return 'Training'
-        elif any(word in text for word in ['consultant', 'consulting', 'advisor']):
-            return 'Consulting'
-        else:
-            return 'Coaching'  # Default
+        return classify_job(title, description)['type']['value']
     
     def _classify_program_type(self, title, description):
         """Classify the program type based on title and description"""
-        text = f"{title} {description}".lower()
-        
-        if any(word in text for word in ['dance', 'pom', 'drill team', 'jazz', 'hip hop']):
-            return 'Dance/Pom'
-        else:
-            return 'Cheerleading'  # Default
+        return classify_job(title, description)['program']['value']
     
     def _parse_date(self, date_text):
         """Parse date string into ISO format"""
@@ -384,21 +528,91 @@ class EdJoinScraper:
         Returns:
             List of all scraped jobs
         """
-        all_jobs = []
+        all_jobs = list(self.iter_cheerleading_jobs(max_per_keyword))
+        self.logger.info(f"Total unique jobs scraped: {len(all_jobs)}")
+        return all_jobs
+    
+    def iter_cheerleading_jobs(self, max_per_keyword=20, checkpoint=None, batched=False):
+        """
+        Lazily scrape all cheerleading-related jobs from EdJoin
+        
+        Args:
+            max_per_keyword: Maximum jobs to scrape per keyword
+            checkpoint: Optional ScrapeCheckpoint; queries before its
+                keyword index and postings it has completed are skipped
+            batched: Run the combined queries from get_search_queries and
+                filter results locally instead of one search per keyword
+            
+        Yields:
+            Unique job dictionaries
+        """
         seen_urls = set()
+        start_index = checkpoint.keyword_index if checkpoint else 0
+        skip_ids = checkpoint.completed_ids if checkpoint else None
         
-        for keyword in self.cheerleading_keywords:
+        queries = self.get_search_queries(batched)
+        
+        # A batched query carries the result budget of the keywords it replaces
+        max_results = max_per_keyword
+        if batched:
+            max_results = -(-max_per_keyword * len(self.cheerleading_keywords) // len(queries))
+        
+        for index, keyword in enumerate(queries):
+            if index < start_index:
+                continue
+            if checkpoint:
+                checkpoint.start_keyword(index)
+            
             self.logger.info(f"Scraping jobs for keyword: {keyword}")
-            jobs = self.search_jobs(keyword, max_per_keyword)
+            
+            jobs = self.iter_search_jobs(
+                keyword, max_results, skip_ids,
+                local_filter=batched,
+                start_page=checkpoint.page if checkpoint else 1,
+                on_page=checkpoint.set_page if checkpoint else None
+            )
             
             # Deduplicate based on source URL
             for job in jobs:
                 if job.get('sourceUrl') not in seen_urls:
-                    all_jobs.append(job)
                     seen_urls.add(job.get('sourceUrl'))
+                    yield job
+    
+    def compare_search_modes(self, max_per_keyword=5):
+        """
+        Run a sweep in per-keyword and in batched mode and compare coverage
         
-        self.logger.info(f"Total unique jobs scraped: {len(all_jobs)}")
-        return all_jobs
+        Args:
+            max_per_keyword: Maximum jobs to scrape per keyword
+            
+        Returns:
+            Dictionary with search request counts, timings and result overlap
+        """
+        report = {}
+        result_ids = {}
+        
+        for mode, batched in (('per_keyword', False), ('batched', True)):
+            requests_before = self.search_requests
+            started = time.time()
+            jobs = list(self.iter_cheerleading_jobs(max_per_keyword, batched=batched))
+            result_ids[mode] = {job.get('id') for job in jobs if job.get('id')}
+            report[mode] = {
+                'queries': self.get_search_queries(batched),
+                'search_requests': self.search_requests - requests_before,
+                'jobs_found': len(jobs),
+                'duration_seconds': round(time.time() - started, 2)
+            }
+        
+        per_keyword_ids = result_ids['per_keyword']
+        batched_ids = result_ids['batched']
+        overlap = per_keyword_ids & batched_ids
+        
+        report['overlap'] = len(overlap)
+        report['only_per_keyword'] = sorted(per_keyword_ids - batched_ids)
+        report['only_batched'] = sorted(batched_ids - per_keyword_ids)
+        report['coverage'] = round(len(overlap) / len(per_keyword_ids), 3) if per_keyword_ids else 1.0
+        
+        return report
     
     def test_scrape(self, max_jobs=5):
         """
@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+
+from flask import Response, stream_with_context
+
+from app.services.serializers import dumps
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv')
+}
+
+# Rows fetched per database round trip and written per response chunk
+EXPORT_BATCH_SIZE = 1000
+
+
+def _csv_value(value):
+    """Flatten a column value into a CSV cell"""
+    if value is None:
+        return ''
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def iter_ndjson(serializer, rows, projection):
+    """Yield rows as newline-delimited JSON, one chunk per batch"""
+    lines = []
+    for row in rows:
+        lines.append(dumps(serializer.row_to_dict(row, projection)))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield b'\n'.join(lines) + b'\n'
+            lines = []
+    if lines:
+        yield b'\n'.join(lines) + b'\n'
+
+
+def iter_csv(rows, projection):
+    """Yield a CSV header, then rows in chunks of one batch"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    width = len(projection.keys)
+
+    writer.writerow(projection.keys)
+    yield output.getvalue()
+    output.seek(0)
+    output.truncate(0)
+
+    written = 0
+    for row in rows:
+        # Appended id/version columns are not part of the export
+        writer.writerow([_csv_value(value) for value in row[:width]])
+        written += 1
+        if written % EXPORT_BATCH_SIZE == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+
+    if output.tell():
+        yield output.getvalue()
+
+
+def export_response(serializer, query, projection, export_format, name):
+    """
+    Stream a query as an NDJSON or CSV download
+
+    Rows are fetched EXPORT_BATCH_SIZE at a time with yield_per (a server
+    side cursor where the driver supports one) and written out as they
+    arrive, so memory stays constant however many rows match.
+
+    Args:
+        serializer: RowSerializer for the queried model
+        query: Filtered, ordered query selecting projection.columns
+        projection: Projection the query selects
+        export_format: Key of EXPORT_FORMATS
+        name: Download file name without extension
+    """
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    rows = query.yield_per(EXPORT_BATCH_SIZE)
+
+    if export_format == 'csv':
+        chunks = iter_csv(rows, projection)
+    else:
+        chunks = iter_ndjson(serializer, rows, projection)
+
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={name}.{extension}'
+    return response
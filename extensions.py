@@ -0,0 +1,10 @@
+from flask_sqlalchemy import SQLAlchemy
+
+from app.services.db_routing import RoutingSession, track_writes
+
+# Shared database extension, bound to an application by create_app().
+# Models import it directly so they can be declared before any app exists.
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# Sessions that write keep reading from the primary (see db_routing)
+track_writes(db.session)
@@ -0,0 +1,85 @@
+from sqlalchemy import String, cast, func, literal, select, union_all
+
+
+def requested_facets(args, dimensions):
+    """
+    Parse the facets query parameter
+
+    facets=true (or all) requests every dimension, facets=a,b a subset.
+
+    Returns:
+        List of dimension names, empty when facets were not requested
+
+    Raises:
+        ValueError: If an unknown dimension is requested
+    """
+    value = (args.get('facets') or '').strip().lower()
+    if not value or value in ('false', '0', 'no'):
+        return []
+    if value in ('true', '1', 'yes', 'all'):
+        return list(dimensions)
+
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in dimensions]
+    if unknown:
+        raise ValueError(f"Unknown facet(s): {', '.join(unknown)}")
+    return names
+
+
+def facet_counts(session, dimensions, filters, names=None):
+    """
+    Count rows per value of each dimension in a single grouped query
+
+    Each dimension is counted under every active filter except its own,
+    so the counts say how many rows selecting that value would return
+    ("Cheerleading (132)") while the other filters stay applied.
+
+    Args:
+        session: SQLAlchemy session to run the query on
+        dimensions: Mapping of facet name to (column, Enum class or None)
+        filters: Mapping of filter name to SQL expression; filters whose
+            name is not a dimension (e.g. search) apply to every facet
+        names: Dimensions to count; defaults to all of them
+
+    Returns:
+        {facet: {value: count}}, listing every member of enum dimensions
+        (with 0 when nothing matches) and the present values of others
+    """
+    names = list(names or dimensions)
+    if not names:
+        return {}
+
+    selects = []
+    for name in names:
+        column, _ = dimensions[name]
+        other_filters = [expression for key, expression in filters.items() if key != name]
+        selects.append(
+            select(
+                literal(name).label('facet'),
+                cast(column, String).label('value'),
+                func.count().label('count')
+            ).where(column.isnot(None), *other_filters).group_by(column)
+        )
+
+    statement = selects[0] if len(selects) == 1 else union_all(*selects)
+
+    counts = {}
+    for name in names:
+        enum_class = dimensions[name][1]
+        counts[name] = {member.value: 0 for member in enum_class} if enum_class else {}
+
+    for facet, value, count in session.execute(statement):
+        enum_class = dimensions[facet][1]
+        if enum_class:
+            # Enum columns store member names
+            value = _enum_value(enum_class, value)
+        counts[facet][value] = count
+
+    return counts
+
+
+def _enum_value(enum_class, stored):
+    try:
+        return enum_class[stored].value
+    except KeyError:
+        return enum_class(stored).value
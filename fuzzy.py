@@ -0,0 +1,116 @@
+SEARCH_MODES = ('exact', 'fuzzy')
+
+
+def search_mode(args):
+    """
+    Parse the match query parameter
+
+    match=exact (the default) keeps the substring search, match=fuzzy
+    tolerates typos and ranks results by how well they match.
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    mode = (args.get('match') or 'exact').strip().lower()
+    if mode not in SEARCH_MODES:
+        raise ValueError(f'Unknown match mode "{mode}"')
+    return mode
+
+
+def trigrams(word):
+    """Padded character trigrams of a word; the padding weights its start"""
+    padded = f'  {word} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def max_edits(term):
+    """Typos tolerated in a search term: none up to 3 characters, then 1, then 2 from 8"""
+    if len(term) <= 3:
+        return 0
+    if len(term) <= 7:
+        return 1
+    return 2
+
+
+def edit_distance(a, b, limit):
+    """
+    Edit distance counting insertions, deletions, substitutions and swaps
+    of adjacent characters (optimal string alignment)
+
+    Returns:
+        The distance, or limit + 1 as soon as it must exceed limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class TermIndex:
+    """
+    Trigram index over a changing vocabulary, for typo-tolerant lookups
+
+    A word within n edits of a term shares all but at most 4n of the
+    term's trigrams (a swap touches four), so only words passing that
+    count are compared with the exact edit distance.
+    """
+
+    def __init__(self):
+        self._postings = {}
+
+    def add(self, word):
+        for gram in trigrams(word):
+            self._postings.setdefault(gram, set()).add(word)
+
+    def remove(self, word):
+        for gram in trigrams(word):
+            words = self._postings.get(gram)
+            if words is not None:
+                words.discard(word)
+                if not words:
+                    del self._postings[gram]
+
+    def similar(self, term, edits=None):
+        """
+        Vocabulary words within a few edits of a term
+
+        Args:
+            term: Lowercase search token
+            edits: Maximum edit distance; defaults to max_edits(term)
+
+        Returns:
+            Mapping of word to its edit distance (at least 1) from term
+        """
+        edits = max_edits(term) if edits is None else edits
+        if not edits:
+            return {}
+
+        grams = trigrams(term)
+        shared = {}
+        for gram in grams:
+            for word in self._postings.get(gram, ()):
+                shared[word] = shared.get(word, 0) + 1
+
+        needed = len(grams) - 4 * edits
+        matches = {}
+        for word, count in shared.items():
+            if count >= needed and word != term:
+                distance = edit_distance(term, word, edits)
+                if distance <= edits:
+                    matches[word] = distance
+        return matches
@@ -0,0 +1,101 @@
+"""
+Gunicorn settings for production serving (used by main.py and wsgi.py)
+
+Every setting can be overridden from the environment. The app is
+preloaded in the master so workers fork with the API already imported;
+the scraper stack is still imported lazily by whichever worker first
+serves a scraper route.
+
+Graceful reload: `kill -HUP <master pid>` starts fresh workers and lets
+the old ones finish their in-flight requests (up to graceful_timeout).
+Because the app is preloaded, a HUP does not pick up new code; deploy
+code changes with `kill -USR2` (start a new master) followed by `kill
+-QUIT` on the old one.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Threaded workers by default: requests mostly wait on SQLite, which
+# releases the GIL. GUNICORN_WORKER_CLASS=gevent (python main.py --async)
+# serves each connection on a greenlet instead, so one worker can hold
+# worker_connections slow or idle clients with a single OS thread.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+if worker_class == 'gevent':
+    # The app is preloaded in the master, so patch before it is imported
+    from gevent import monkey
+    monkey.patch_all()
+
+    try:
+        # Make psycopg2 cooperative for PostgreSQL deployments
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    except ImportError:
+        pass
+
+preload_app = True
+
+# Worker heartbeat. gthread workers keep heartbeating while a request
+# runs, so per-route budgets are API_REQUEST_TIMEOUT and
+# SCRAPER_REQUEST_TIMEOUT in the app (see request_deadlines)
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers periodically to cap memory growth
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Set GUNICORN_ACCESS_LOG to an empty value to turn access logging off
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Clear metrics snapshots left by a previous master"""
+    metrics_dir = os.getenv('METRICS_DIR')
+    if metrics_dir and os.path.isdir(metrics_dir):
+        for name in os.listdir(metrics_dir):
+            if name.startswith('metrics-'):
+                os.remove(os.path.join(metrics_dir, name))
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the preloading master"""
+    from app.extensions import db
+
+    app = server.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    """Flush the exiting worker's last metrics samples"""
+    metrics_dir = os.getenv('METRICS_DIR')
+    if not metrics_dir:
+        return
+
+    if worker.pid == os.getpid():
+        metrics = server.app.wsgi().extensions.get('request_metrics')
+        if metrics is not None:
+            metrics.flush()
+    else:
+        # Run by the master for a worker that was already gone
+        from app.services.metrics import fold_worker_snapshot
+        fold_worker_snapshot(metrics_dir, worker.pid)
+
+
+def child_exit(server, worker):
+    """Fold an exited worker's metrics snapshot into the exited-workers total"""
+    metrics_dir = os.getenv('METRICS_DIR')
+    if metrics_dir:
+        from app.services.metrics import fold_worker_snapshot
+        fold_worker_snapshot(metrics_dir, worker.pid)
@@ -0,0 +1,72 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, make_response, request
+from sqlalchemy import func
+
+
+def table_version(model, version_column):
+    """
+    Cheap version string for a whole table
+
+    Every write path bumps the row's version column to utcnow, so the
+    newest version plus the row count changes whenever rows are created,
+    updated or deleted.
+    """
+    count, latest = model.query.with_entities(func.count(model.id), func.max(version_column)).one()
+    return f"{count}:{latest.isoformat() if latest else ''}"
+
+
+def row_version(model, version_column, row_id):
+    """Version string for a single row, or None if the row does not exist"""
+    row = model.query.with_entities(version_column).filter(model.id == row_id).first()
+    if row is None:
+        return None
+    return f"{row_id}:{row[0].isoformat() if row[0] else ''}"
+
+
+def make_etag(version):
+    """Build the ETag for the current request at a given data version"""
+    args = sorted(request.args.items(multi=True))
+    key = f"{request.endpoint}|{version}|{args}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+
+def conditional(version_func):
+    """
+    Answer conditional GETs with 304 Not Modified while the data is unchanged
+
+    version_func receives the view's URL arguments and returns a version
+    string (or None to skip caching). The weak ETag combines that version
+    with the endpoint and query parameters, and a matching If-None-Match
+    is answered before the view's query and serialization ever run.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                version = version_func(**kwargs)
+            except Exception:
+                # Never let a failed version lookup break the endpoint itself
+                version = None
+
+            if version is None:
+                return view(*args, **kwargs)
+
+            etag = make_etag(version)
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            # Let clients keep the body but revalidate on every poll
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        return wrapper
+
+    return decorator
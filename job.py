@@ -1,8 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-# db will be injected from app.py
-db = None
+from app.extensions import db
 
 class JobType(Enum):
     COACHING = "Coaching"
@@ -42,10 +41,44 @@ class Job(db.Model):
     
     # Scraping metadata
     source_url = db.Column(db.String(500))
-    source_site = db.Column(db.String(100))
+    source_site = db.Column(db.String(100), index=True)
     scraped_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # (JSON key, attribute, kind) in to_dict order, used by the projected
+    # list serializer in app.services.serializers
+    SERIALIZED_FIELDS = [
+        ('id', 'id', None),
+        ('title', 'title', None),
+        ('description', 'description', None),
+        ('type', 'type', 'enum'),
+        ('program', 'program', 'enum'),
+        ('location', 'location', None),
+        ('state', 'state', None),
+        ('organization', 'organization', None),
+        ('requirements', 'requirements', None),
+        ('compensation', 'compensation', None),
+        ('contactEmail', 'contact_email', None),
+        ('contactPhone', 'contact_phone', None),
+        ('postedDate', 'posted_date', 'datetime'),
+        ('deadline', 'deadline', 'datetime'),
+        ('status', 'status', 'enum'),
+        ('sourceUrl', 'source_url', None),
+        ('sourceSite', 'source_site', None),
+        ('scrapedAt', 'scraped_at', 'datetime'),
+        ('lastUpdated', 'last_updated', 'datetime')
+    ]
+    
+    # Fields returned by list endpoints with view=summary (what JobCard
+    # renders), and the long text fields that may be truncated in SQL
+    SUMMARY_FIELDS = [
+        'id', 'title', 'description', 'type', 'program', 'location', 'state',
+        'organization', 'compensation', 'postedDate', 'deadline', 'status',
+        'sourceUrl', 'sourceSite'
+    ]
+    TRUNCATABLE_FIELDS = ['description', 'requirements']
+    SUMMARY_TRUNCATE = 200
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -0,0 +1,92 @@
+import re
+
+# Keyword lists per classification dimension, in priority order. The first
+# category with any match wins; the default applies when nothing matches.
+JOB_TYPE_KEYWORDS = [
+    ('Coaching', ['coach', 'coaching']),
+    ('Choreography', ['choreograph', 'choreography']),
+    ('Judging', ['judge', 'judging', 'official']),
+    ('Training', ['instructor', 'training', 'teach']),
+    ('Consulting', ['consultant', 'consulting', 'advisor'])
+]
+
+PROGRAM_TYPE_KEYWORDS = [
+    ('Dance/Pom', ['dance', 'pom', 'drill team', 'jazz', 'hip hop'])
+]
+
+DIMENSIONS = {
+    'type': {'keywords': JOB_TYPE_KEYWORDS, 'default': 'Coaching'},
+    'program': {'keywords': PROGRAM_TYPE_KEYWORDS, 'default': 'Cheerleading'}
+}
+
+
+class JobClassifier:
+    """
+    Classifies job postings by job type and program type in a single pass
+
+    Every keyword of every dimension is compiled into one alternation
+    regex, so the text is scanned once no matter how many keywords or
+    categories there are. Substring semantics match the original
+    `word in text` checks (e.g. 'coach' also matches 'coaches').
+    """
+
+    def __init__(self, dimensions=None):
+        self.dimensions = dimensions or DIMENSIONS
+
+        # term -> list of (dimension, category priority index)
+        self._terms = {}
+        for dimension, config in self.dimensions.items():
+            for priority, (category, words) in enumerate(config['keywords']):
+                for word in words:
+                    self._terms.setdefault(word.lower(), []).append((dimension, priority))
+
+        # Longest terms first so 'choreography' wins over 'choreograph'
+        alternation = '|'.join(re.escape(term) for term in sorted(self._terms, key=len, reverse=True))
+        self._pattern = re.compile(alternation)
+
+    def classify(self, *texts):
+        """
+        Classify text along every dimension
+
+        Args:
+            texts: Text fragments to classify, e.g. title and description
+
+        Returns:
+            Dictionary keyed by dimension, each with the chosen 'value',
+            a 'confidence' between 0 and 1 (share of the dimension's
+            keyword hits that support the value, 0 for the default) and
+            the matched keywords as 'evidence'
+        """
+        text = ' '.join(t for t in texts if t).lower()
+
+        hits = {dimension: {} for dimension in self.dimensions}
+        for match in self._pattern.finditer(text):
+            term = match.group(0)
+            for dimension, priority in self._terms[term]:
+                hits[dimension].setdefault(priority, []).append(term)
+
+        results = {}
+        for dimension, config in self.dimensions.items():
+            dimension_hits = hits[dimension]
+            if not dimension_hits:
+                results[dimension] = {'value': config['default'], 'confidence': 0.0, 'evidence': []}
+                continue
+
+            priority = min(dimension_hits)
+            evidence = dimension_hits[priority]
+            total = sum(len(terms) for terms in dimension_hits.values())
+            results[dimension] = {
+                'value': config['keywords'][priority][0],
+                'confidence': round(len(evidence) / total, 2),
+                'evidence': sorted(set(evidence))
+            }
+
+        return results
+
+
+_classifier = JobClassifier()
+
+
+def classify_job(title, description=''):
+    """Classify a posting's job type and program type from its title and description"""
+    return _classifier.classify(title, description)
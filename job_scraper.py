@@ -10,6 +10,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from app.services.edjoin_scraper import EdJoinScraper
+from app.services.job_classifier import classify_job
+from app.services.scrape_checkpoint import CheckpointStore
+from app.services.query_tracker import track_queries
+from app.services.request_deadlines import RequestTimeout, deadline_suspended, request_timed_out
 
 # db will be injected from the routes
 db = None
@@ -17,11 +21,17 @@ Job = None
 JobType = None
 ProgramType = None
 JobStatus = None
+ScrapeRun = None
 
 class JobScraper:
     """Service for scraping job postings from various education job sites"""
     
-    def __init__(self):
+    def __init__(self, checkpoint_path=None):
+        # Sweep progress is persisted here so an interrupted run can resume
+        self.checkpoints = CheckpointStore(
+            checkpoint_path or os.getenv('SCRAPE_CHECKPOINT_PATH', 'scrape_checkpoints.json')
+        )
+        
         self.sources = {
             'edjoin': {
                 'name': 'EdJoin',
@@ -58,13 +68,15 @@ class JobScraper:
         """Get configuration for all scraper sources"""
         return self.sources
     
-    def scrape_jobs(self, sources=['all'], max_jobs=50):
+    def scrape_jobs(self, sources=['all'], max_jobs=50, resume=True, batched=False):
         """
         Scrape jobs from specified sources
         
         Args:
             sources: List of source names or ['all'] for all sources
             max_jobs: Maximum number of jobs to scrape per source
+            resume: Continue from a saved checkpoint instead of starting over
+            batched: Combine keywords into as few search requests as possible
             
         Returns:
             Dictionary with scraping results
@@ -84,24 +96,46 @@ class JobScraper:
                 results['errors'].append(f'Source "{source}" is not available')
                 continue
             
+            # Recorded up front so a run that dies midway still shows up
+            run = ScrapeRun(source=source, started_at=datetime.utcnow())
+            db.session.add(run)
+            db.session.commit()
+            run_id = run.id
+            
+            source_results = {}
             try:
-                if source == 'edjoin':
-                    source_results = self._scrape_edjoin(max_jobs)
-                else:
-                    source_results = {'new_jobs': 0, 'updated_jobs': 0, 'error': 'Not implemented'}
+                with track_queries(f'scrape:{source}'):
+                    if source == 'edjoin':
+                        source_results = self._scrape_edjoin(max_jobs, resume=resume, batched=batched)
+                    else:
+                        source_results = {'new_jobs': 0, 'updated_jobs': 0, 'error': 'Not implemented'}
                 
                 results['sources_scraped'].append({
                     'source': source,
+                    'run_id': run_id,
                     'new_jobs': source_results.get('new_jobs', 0),
                     'updated_jobs': source_results.get('updated_jobs', 0),
-                    'error': source_results.get('error')
+                    'resumed': source_results.get('resumed', False),
+                    'error': source_results.get('error'),
+                    'telemetry': source_results.get('telemetry')
                 })
                 
                 results['total_new_jobs'] += source_results.get('new_jobs', 0)
                 results['total_updated_jobs'] += source_results.get('updated_jobs', 0)
                 
             except Exception as e:
+                source_results = {'error': str(e)}
                 results['errors'].append(f'Error scraping {source}: {str(e)}')
+            
+            finally:
+                # Close the run even when the request deadline cut it short
+                with deadline_suspended():
+                    run.finish(source_results)
+                    db.session.commit()
+            
+            # Past the deadline every statement fails, so stop here
+            if request_timed_out():
+                break
         
         return results
     
@@ -118,46 +152,88 @@ class JobScraper:
         except Exception as e:
             return {'error': str(e)}
     
-    def _scrape_edjoin(self, max_jobs=50):
+    def compare_search_modes(self, source, max_jobs=5):
+        """Compare per-keyword and batched search coverage for a source"""
+        if not self.is_source_available(source):
+            return {'error': f'Source "{source}" is not available'}
+        
+        try:
+            if source == 'edjoin':
+                return EdJoinScraper().compare_search_modes(max_per_keyword=max_jobs)
+            else:
+                return {'error': 'Coverage comparison not implemented for this source'}
+        except Exception as e:
+            return {'error': str(e)}
+    
+    def _scrape_edjoin(self, max_jobs=50, resume=True, batched=False):
         """
         Scrape jobs from EdJoin using the dedicated scraper
+        
+        Each job is committed as soon as it is scraped and recorded in the
+        source checkpoint, so an interrupted sweep resumes at the keyword
+        it was on and skips postings that were already stored.
         """
         results = {'new_jobs': 0, 'updated_jobs': 0}
+        scraper = EdJoinScraper()
         
         try:
-            scraper = EdJoinScraper()
-            jobs_data = scraper.scrape_all_cheerleading_jobs(max_per_keyword=max_jobs//len(scraper.cheerleading_keywords))
+            checkpoint = self.checkpoints.get('edjoin', scraper.get_search_queries(batched))
+            if not resume:
+                checkpoint.clear()
+            results['resumed'] = checkpoint.resumed
+            
+            # One query for the known ids instead of a lookup per scraped job
+            known_ids = {job_id for (job_id,) in db.session.query(Job.id)}
+            
+            processed = 0
+            jobs_data = scraper.iter_cheerleading_jobs(
+                max_per_keyword=max_jobs//len(scraper.cheerleading_keywords),
+                checkpoint=checkpoint,
+                batched=batched
+            )
             
             for job_data in jobs_data:
+                processed += 1
                 try:
-                    # Check if job already exists
-                    existing_job = Job.query.get(job_data['id'])
+                    with scraper.telemetry.timer('store'):
+                        # Only postings seen before need their row loaded
+                        existing_job = db.session.get(Job, job_data['id']) if job_data['id'] in known_ids else None
+                        
+                        if existing_job:
+                            # Update existing job
+                            for key, value in job_data.items():
+                                if hasattr(existing_job, key) and key != 'id':
+                                    setattr(existing_job, key, value)
+                            existing_job.last_updated = datetime.utcnow()
+                        else:
+                            # Create new job
+                            new_job = Job.from_dict(job_data)
+                            db.session.add(new_job)
+                        
+                        db.session.commit()
+                        # Counted once committed, so an aborted commit is not reported
+                        results['updated_jobs' if existing_job else 'new_jobs'] += 1
+                        known_ids.add(job_data['id'])
+                        checkpoint.mark_completed(job_data['id'])
                     
-                    if existing_job:
-                        # Update existing job
-                        for key, value in job_data.items():
-                            if hasattr(existing_job, key) and key != 'id':
-                                setattr(existing_job, key, value)
-                        existing_job.last_updated = datetime.utcnow()
-                        results['updated_jobs'] += 1
-                    else:
-                        # Create new job
-                        new_job = Job.from_dict(job_data)
-                        db.session.add(new_job)
-                        results['new_jobs'] += 1
-                    
-                    db.session.commit()
+                except RequestTimeout:
+                    # Abort the sweep, keeping the checkpoint for the next run
+                    db.session.rollback()
+                    raise
                     
                 except Exception as e:
                     db.session.rollback()
                     print(f"Error processing job {job_data.get('id', 'unknown')}: {e}")
                     continue
             
-            results['total_processed'] = len(jobs_data)
+            # The sweep finished, so the next run starts from the first keyword
+            checkpoint.clear()
+            results['total_processed'] = processed
             
         except Exception as e:
             results['error'] = str(e)
         
+        results['telemetry'] = scraper.telemetry.to_dict()
         return results
     
     def _test_scrape_edjoin(self, max_jobs=5):
@@ -175,30 +251,11 @@ class JobScraper:
     
     def _extract_job_type(self, title, description):
         """Extract job type from title and description"""
-        title_lower = title.lower()
-        desc_lower = description.lower()
-        
-        if any(word in title_lower for word in ['coach', 'coaching']):
-            return JobType.COACHING
-        elif any(word in title_lower for word in ['choreograph', 'choreography']):
-            return JobType.CHOREOGRAPHY
-        elif any(word in title_lower for word in ['judge', 'judging', 'official']):
-            return JobType.JUDGING
-        elif any(word in title_lower for word in ['instructor', 'training', 'teach']):
-            return JobType.TRAINING
-        elif any(word in title_lower for word in ['consultant', 'consulting', 'advisor']):
-            return JobType.CONSULTING
-        else:
-            return JobType.COACHING  # Default
+        return JobType(classify_job(title)['type']['value'])
     
     def _extract_program_type(self, title, description):
         """Extract program type from title and description"""
-        text = f"{title} {description}".lower()
-        
-        if any(word in text for word in ['dance', 'pom', 'drill team', 'jazz', 'hip hop']):
-            return ProgramType.DANCE_POM
-        else:
-            return ProgramType.CHEERLEADING  # Default for most positions
+        return ProgramType(classify_job(title, description)['program']['value'])
     
     def _clean_text(self, text):
         """Clean and normalize text content"""
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -6,59 +6,229 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from datetime import datetime
 import uuid
 
+from app.services.http_cache import conditional, table_version, row_version
+from app.services.query_cache import cached_response
+from app.services.query_tracker import query_budget
+from app.services.exports import EXPORT_FORMATS, export_response
+from app.services.facets import requested_facets, facet_counts
+from app.services.fuzzy import search_mode
+from app.services.bulk import (
+    get_bulk_items, existing_ids, write_in_chunks, item_result, bulk_response
+)
+
 # These will be injected from app.py
 db = None
 Job = None
 JobType = None
 ProgramType = None
 JobStatus = None
+job_serializer = None
+job_index = None
+listings_from_index = False
+fuzzy_search = False
+suggestions_enabled = False
 
 jobs_bp = Blueprint('jobs', __name__)
 
+# Columns that must be present when creating a job
+REQUIRED_JOB_FIELDS = ['title', 'description', 'type', 'program', 'location', 'state', 'organization']
+
+# Fields the search box completes, and the most completions per field
+SUGGEST_FIELDS = ['organization', 'location', 'title']
+MAX_SUGGESTIONS = 20
+
+def _jobs_version(**kwargs):
+    """Data version of the jobs table, for conditional GETs"""
+    if job_index is not None and listings_from_index:
+        return job_index.version()
+    return table_version(Job, Job.last_updated)
+
+def _job_version(job_id):
+    """Data version of a single job, for conditional GETs"""
+    return row_version(Job, Job.last_updated, job_id)
+
+def _job_filters(args):
+    """
+    SQL filter expressions for the listing query parameters
+
+    Returns:
+        Mapping of filter name (program, state, type, status, search) to
+        expression, for the active filters only
+    """
+    # Get query parameters
+    program = args.get('program')
+    state = args.get('state')
+    job_type = args.get('type')
+    status = args.get('status')
+    search = args.get('search')
+    
+    filters = {}
+    
+    if program and program != 'all':
+        filters['program'] = Job.program == ProgramType(program)
+    
+    if state and state != 'all':
+        filters['state'] = Job.state == state
+        
+    if job_type and job_type != 'all':
+        filters['type'] = Job.type == JobType(job_type)
+        
+    if status and status != 'all':
+        filters['status'] = Job.status == JobStatus(status)
+        
+    if search:
+        search_term = f"%{search}%"
+        filters['search'] = db.or_(
+            Job.title.ilike(search_term),
+            Job.description.ilike(search_term),
+            Job.organization.ilike(search_term),
+            Job.location.ilike(search_term)
+        )
+    
+    return filters
+
+def _filtered_jobs_query(args):
+    """Build the filtered, ordered jobs query shared by listing and export"""
+    query = Job.query.filter(*_job_filters(args).values())
+    
+    # Order by posted date (newest first)
+    return query.order_by(Job.posted_date.desc())
+
+def _job_facet_dimensions():
+    """FilterBar dimensions that get_jobs can return facet counts for"""
+    return {
+        'program': (Job.program, ProgramType),
+        'state': (Job.state, None),
+        'type': (Job.type, JobType),
+        'status': (Job.status, JobStatus)
+    }
+
 @jobs_bp.route('/', methods=['GET'])
+@query_budget(3)
+@cached_response('jobs')
+@conditional(_jobs_version)
 def get_jobs():
     """Get all jobs with optional filtering"""
     try:
-        # Get query parameters
-        program = request.args.get('program')
-        state = request.args.get('state')
-        job_type = request.args.get('type')
-        status = request.args.get('status')
-        search = request.args.get('search')
+        # Sparse fieldsets: fields=a,b,c or view=summary, with long text
+        # optionally truncated server-side via truncate=N
+        try:
+            projection = job_serializer.project_from_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        # Build query
-        query = Job.query
+        # Optional per-option counts for FilterBar: facets=true or
+        # facets=program,state,...
+        dimensions = _job_facet_dimensions()
+        try:
+            facet_names = requested_facets(request.args, dimensions)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        if program and program != 'all':
-            query = query.filter(Job.program == ProgramType(program))
+        # search=... matches exact substrings, or tolerates typos and ranks
+        # the results with match=fuzzy
+        try:
+            mode = search_mode(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        if state and state != 'all':
-            query = query.filter(Job.state == state)
-            
-        if job_type and job_type != 'all':
-            query = query.filter(Job.type == JobType(job_type))
-            
-        if status and status != 'all':
-            query = query.filter(Job.status == JobStatus(status))
-            
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                db.or_(
-                    Job.title.ilike(search_term),
-                    Job.description.ilike(search_term),
-                    Job.organization.ilike(search_term),
-                    Job.location.ilike(search_term)
-                )
-            )
+        if mode == 'fuzzy' and (job_index is None or not fuzzy_search):
+            return jsonify({
+                'success': False,
+                'error': 'Fuzzy search is disabled'
+            }), 400
+        
+        # The in-memory index answers fuzzy searches, and every listing it
+        # can when enabled; it returns None for the rest
+        use_index = job_index is not None and (listings_from_index or mode == 'fuzzy')
+        rows = job_index.query(request.args, projection) if use_index else None
+        if rows is None:
+            # Select only the projected columns so rows are encoded without
+            # building models
+            rows = _filtered_jobs_query(request.args).with_entities(*projection.columns).all()
+        
+        extra = None
+        if facet_names:
+            facets = job_index.facet_counts(request.args, facet_names) if use_index else None
+            if facets is None:
+                facets = facet_counts(db.session, dimensions, _job_filters(request.args), facet_names)
+            extra = {'facets': facets}
+        
+        return Response(job_serializer.encode_list(rows, 'jobs', projection, extra), mimetype='application/json')
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@jobs_bp.route('/export', methods=['GET'])
+def export_jobs():
+    """Stream all jobs matching the listing filters as NDJSON or CSV"""
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported export format "{export_format}"'
+            }), 400
+        
+        try:
+            projection = job_serializer.project_from_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        query = _filtered_jobs_query(request.args).with_entities(*projection.columns)
+        
+        return export_response(job_serializer, query, projection, export_format, 'jobs')
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@jobs_bp.route('/suggest', methods=['GET'])
+@query_budget(1)
+def suggest_jobs():
+    """Complete a search box prefix with the most common organizations, locations and titles"""
+    try:
+        if job_index is None or not suggestions_enabled:
+            return jsonify({
+                'success': False,
+                'error': 'Suggestions are disabled'
+            }), 400
         
-        # Order by posted date (newest first)
-        jobs = query.order_by(Job.posted_date.desc()).all()
+        prefix = request.args.get('q', '')
+        fields = [field.strip() for field in request.args.get('field', '').split(',') if field.strip()]
+        unknown = [field for field in fields if field not in SUGGEST_FIELDS]
+        if unknown:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown suggestion field(s): {', '.join(unknown)}"
+            }), 400
         
+        limit = request.args.get('limit', 8, type=int)
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+        
+        # Answered from the index's prefix tries; the jobs table is only
+        # read when the index has writes to catch up on
         return jsonify({
             'success': True,
-            'jobs': [job.to_dict() for job in jobs],
-            'count': len(jobs)
+            'prefix': prefix,
+            'suggestions': job_index.suggest(prefix, fields or SUGGEST_FIELDS, limit)
         })
         
     except Exception as e:
@@ -68,6 +238,8 @@ def get_jobs():
         }), 500
 
 @jobs_bp.route('/<job_id>', methods=['GET'])
+@query_budget(2)
+@conditional(_job_version)
 def get_job(job_id):
     """Get a specific job by ID"""
     try:
@@ -119,6 +291,55 @@ def create_job():
             'error': str(e)
         }), 500
 
+def _apply_job_updates(job, data):
+    """Apply a partial update payload to a job"""
+    # Update job fields
+    for key, value in data.items():
+        if hasattr(job, key) and key != 'id':
+            if key == 'type' and value:
+                job.type = JobType(value)
+            elif key == 'program' and value:
+                job.program = ProgramType(value)
+            elif key == 'status' and value:
+                job.status = JobStatus(value)
+            elif key in ['postedDate', 'deadline'] and value:
+                setattr(job, key.replace('Date', '_date').replace('line', 'line'), 
+                       datetime.fromisoformat(value.replace('Z', '+00:00')))
+            else:
+                setattr(job, key.replace('Email', '_email').replace('Phone', '_phone'), value)
+    
+    job.last_updated = datetime.utcnow()
+
+def _validate_job_data(data, partial=False):
+    """Return the validation errors for a job payload"""
+    if not isinstance(data, dict):
+        return ['Item must be an object']
+    
+    errors = []
+    
+    if not partial:
+        missing = [field for field in REQUIRED_JOB_FIELDS if not data.get(field)]
+        if missing:
+            errors.append(f"Missing required fields: {', '.join(missing)}")
+    
+    for key, enum in (('type', JobType), ('program', ProgramType), ('status', JobStatus)):
+        value = data.get(key)
+        if value:
+            try:
+                enum(value)
+            except ValueError:
+                errors.append(f'Invalid {key} "{value}"')
+    
+    for key in ('postedDate', 'deadline'):
+        value = data.get(key)
+        if value:
+            try:
+                datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except (ValueError, AttributeError):
+                errors.append(f'Invalid {key} "{value}"')
+    
+    return errors
+
 @jobs_bp.route('/<job_id>', methods=['PUT'])
 def update_job(job_id):
     """Update an existing job"""
@@ -132,22 +353,7 @@ def update_job(job_id):
         
         data = request.get_json()
         
-        # Update job fields
-        for key, value in data.items():
-            if hasattr(job, key) and key != 'id':
-                if key == 'type' and value:
-                    job.type = JobType(value)
-                elif key == 'program' and value:
-                    job.program = ProgramType(value)
-                elif key == 'status' and value:
-                    job.status = JobStatus(value)
-                elif key in ['postedDate', 'deadline'] and value:
-                    setattr(job, key.replace('Date', '_date').replace('line', 'line'), 
-                           datetime.fromisoformat(value.replace('Z', '+00:00')))
-                else:
-                    setattr(job, key.replace('Email', '_email').replace('Phone', '_phone'), value)
-        
-        job.last_updated = datetime.utcnow()
+        _apply_job_updates(job, data)
         db.session.commit()
         
         return jsonify({
@@ -189,21 +395,165 @@ def delete_job(job_id):
             'error': str(e)
         }), 500
 
+@jobs_bp.route('/bulk', methods=['POST'])
+def bulk_create_jobs():
+    """Create many job postings, validated up front and written in chunked transactions"""
+    try:
+        items, error = get_bulk_items(request.get_json(silent=True), 'jobs')
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        results = [None] * len(items)
+        valid = []
+        seen_ids = set()
+        
+        for index, data in enumerate(items):
+            errors = _validate_job_data(data)
+            if not errors:
+                # Generate ID if not provided
+                if not data.get('id'):
+                    data['id'] = f"job-{str(uuid.uuid4())[:8]}"
+                if data['id'] in seen_ids:
+                    errors.append('Duplicate id in request')
+                seen_ids.add(data['id'])
+            
+            if errors:
+                item_id = data.get('id') if isinstance(data, dict) else None
+                results[index] = item_result(index, item_id, errors)
+            else:
+                valid.append((index, data))
+        
+        # Reject IDs that already exist with one query per chunk
+        taken = existing_ids(db.session, Job, [data['id'] for _, data in valid])
+        if taken:
+            for index, data in valid:
+                if data['id'] in taken:
+                    results[index] = item_result(index, data['id'], ['Job already exists'])
+            valid = [(index, data) for index, data in valid if data['id'] not in taken]
+        
+        def create_chunk(chunk):
+            db.session.add_all([Job.from_dict(data) for _, data in chunk])
+        
+        failures = write_in_chunks(db.session, valid, create_chunk)
+        
+        for index, data in valid:
+            results[index] = item_result(index, data['id'], [failures[index]] if index in failures else None)
+        
+        return bulk_response(results, 'Bulk job creation completed')
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@jobs_bp.route('/bulk', methods=['PUT'])
+def bulk_update_jobs():
+    """Update many jobs by ID, validated up front and written in chunked transactions"""
+    try:
+        items, error = get_bulk_items(request.get_json(silent=True), 'jobs')
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        results = [None] * len(items)
+        valid = []
+        
+        for index, data in enumerate(items):
+            errors = _validate_job_data(data, partial=True)
+            if not errors and not data.get('id'):
+                errors.append('Missing id')
+            
+            if errors:
+                item_id = data.get('id') if isinstance(data, dict) else None
+                results[index] = item_result(index, item_id, errors)
+            else:
+                valid.append((index, data))
+        
+        found = existing_ids(db.session, Job, [data['id'] for _, data in valid])
+        for index, data in valid:
+            if data['id'] not in found:
+                results[index] = item_result(index, data['id'], ['Job not found'])
+        valid = [(index, data) for index, data in valid if data['id'] in found]
+        
+        def update_chunk(chunk):
+            # Load the whole chunk in one query
+            jobs = {job.id: job for job in Job.query.filter(Job.id.in_([data['id'] for _, data in chunk]))}
+            for _, data in chunk:
+                _apply_job_updates(jobs[data['id']], data)
+        
+        failures = write_in_chunks(db.session, valid, update_chunk)
+        
+        for index, data in valid:
+            results[index] = item_result(index, data['id'], [failures[index]] if index in failures else None)
+        
+        return bulk_response(results, 'Bulk job update completed')
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@jobs_bp.route('/bulk', methods=['DELETE'])
+def bulk_delete_jobs():
+    """Delete many jobs by ID in chunked transactions"""
+    try:
+        ids, error = get_bulk_items(request.get_json(silent=True), 'ids')
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        found = existing_ids(db.session, Job, ids)
+        valid = [(index, job_id) for index, job_id in enumerate(ids) if job_id in found]
+        
+        def delete_chunk(chunk):
+            Job.query.filter(Job.id.in_([job_id for _, job_id in chunk])).delete(synchronize_session=False)
+        
+        failures = write_in_chunks(db.session, valid, delete_chunk)
+        
+        results = []
+        for index, job_id in enumerate(ids):
+            if job_id not in found:
+                results.append(item_result(index, job_id, ['Job not found']))
+            else:
+                results.append(item_result(index, job_id, [failures[index]] if index in failures else None))
+        
+        return bulk_response(results, 'Bulk job deletion completed')
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @jobs_bp.route('/stats', methods=['GET'])
+@query_budget(3)
+@conditional(_jobs_version)
 def get_job_stats():
     """Get job statistics"""
     try:
-        total_jobs = Job.query.count()
-        active_jobs = Job.query.filter(Job.status == JobStatus.ACTIVE).count()
-        
-        # Jobs by program
-        cheerleading_jobs = Job.query.filter(Job.program == ProgramType.CHEERLEADING).count()
-        dance_jobs = Job.query.filter(Job.program == ProgramType.DANCE_POM).count()
+        # One pass for the totals, one GROUP BY for the per-type counts
+        total_jobs, active_jobs, cheerleading_jobs, dance_jobs = db.session.query(
+            db.func.count(Job.id),
+            db.func.count(db.case((Job.status == JobStatus.ACTIVE, 1))),
+            db.func.count(db.case((Job.program == ProgramType.CHEERLEADING, 1))),
+            db.func.count(db.case((Job.program == ProgramType.DANCE_POM, 1)))
+        ).one()
         
         # Jobs by type
-        job_types = {}
-        for job_type in JobType:
-            count = Job.query.filter(Job.type == job_type).count()
+        job_types = {job_type.value: 0 for job_type in JobType}
+        for job_type, count in db.session.query(Job.type, db.func.count(Job.id)).group_by(Job.type):
             job_types[job_type.value] = count
         
         return jsonify({
@@ -2,8 +2,13 @@
 """
 Cheer Guru Connect Backend - Main Application Entry Point
 A Flask-based API server for the national cheerleading jobs board.
+
+    python main.py          Multi-worker gunicorn server (gunicorn.conf.py)
+    python main.py --async  Same, with gevent workers for many slow clients
+    python main.py --dev    Flask development server (add --debug for the reloader)
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -13,38 +18,58 @@ current_dir = Path(__file__).parent
 parent_dir = current_dir.parent
 sys.path.insert(0, str(parent_dir))
 
-try:
-    from simple_app import app
-except ImportError:
-    # Fallback: create a minimal Flask app if simple_app is not available
-    from flask import Flask, jsonify
-    from flask_cors import CORS
-    
-    app = Flask(__name__)
-    CORS(app)
-    
-    @app.route('/')
-    def home():
-        return jsonify({
-            "message": "Cheer Guru Connect API",
-            "status": "Backend is running successfully!",
-            "version": "2.0.0"
-        })
-    
-    @app.route('/api/health')
-    def health():
-        return jsonify({
-            "status": "healthy",
-            "message": "Backend service is operational"
-        })
+
+def serve_production(args):
+    """Run the app under gunicorn with the settings from gunicorn.conf.py"""
+    from gunicorn.app.wsgiapp import WSGIApplication
+
+    if args.use_async:
+        # Read by gunicorn.conf.py, which monkey patches before preloading
+        os.environ['GUNICORN_WORKER_CLASS'] = 'gevent'
+
+    options = ['-c', str(current_dir / 'gunicorn.conf.py')]
+    if args.workers:
+        options += ['--workers', str(args.workers)]
+    if args.threads:
+        options += ['--threads', str(args.threads)]
+    if args.connections:
+        options += ['--worker-connections', str(args.connections)]
+
+    sys.argv = ['gunicorn', *options, '--bind', f'0.0.0.0:{args.port}', 'wsgi:app']
+    WSGIApplication("%(prog)s [OPTIONS] [APP_MODULE]").run()
+
+
+def serve_development(args):
+    """Run the Flask development server"""
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    with app.app_context():
+        # Create all database tables
+        db.create_all()
+
+    app.run(host='0.0.0.0', port=args.port, debug=args.debug)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Cheer Guru Connect API server')
+    parser.add_argument('--dev', action='store_true', help='Use the Flask development server')
+    parser.add_argument('--debug', action='store_true', help='Enable debug mode with --dev')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Use gevent workers (requires gevent)')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)), help='Port to listen on')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: WEB_CONCURRENCY or 2 x CPUs + 1)')
+    parser.add_argument('--threads', type=int, help='Threads per worker (default: GUNICORN_THREADS or 4)')
+    parser.add_argument('--connections', type=int,
+                        help='Connections per gevent worker (default: GUNICORN_WORKER_CONNECTIONS or 1000)')
+    args = parser.parse_args()
+
+    if args.dev:
+        serve_development(args)
+    else:
+        serve_production(args)
+
 
 if __name__ == '__main__':
-    # Get port from environment variable or default to 5000
-    port = int(os.environ.get('PORT', 5000))
-    
-    # Run the Flask application
-    app.run(
-        host='0.0.0.0',
-        port=port,
-        debug=False  # Set to False for production
-    )
+    main()
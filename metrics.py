@@ -0,0 +1,302 @@
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Running total of the workers that have exited, in METRICS_DIR
+EXITED_SNAPSHOT = 'metrics-exited.json'
+
+logger = logging.getLogger(__name__)
+
+
+class Counter:
+    """Prometheus counter, one value per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values = {}
+
+    def empty(self):
+        return Counter(self.name, self.help, self.labels)
+
+    def inc(self, label_values, amount=1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def merge(self, values):
+        for label_values, value in values.items():
+            self.inc(label_values, value)
+
+    def render(self):
+        for label_values, value in sorted(self.values.items()):
+            yield f"{self.name}{_labels(self.labels, label_values)} {value}"
+
+
+class Histogram:
+    """Prometheus histogram, one bucket series per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels, buckets):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.values = {}
+
+    def empty(self):
+        return Histogram(self.name, self.help, self.labels, self.buckets)
+
+    def observe(self, label_values, value):
+        # [per-bucket counts..., sum, count]
+        series = self.values.setdefault(label_values, [0] * len(self.buckets) + [0, 0])
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def merge(self, values):
+        for label_values, other in values.items():
+            series = self.values.setdefault(label_values, [0] * len(other))
+            for i, value in enumerate(other):
+                series[i] += value
+
+    def render(self):
+        for label_values, series in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels(self.labels + ('le',), label_values + (repr(float(bound)),))} {cumulative}"
+            yield f"{self.name}_bucket{_labels(self.labels + ('le',), label_values + ('+Inf',))} {series[-1]}"
+            yield f"{self.name}_sum{_labels(self.labels, label_values)} {series[-2]}"
+            yield f"{self.name}_count{_labels(self.labels, label_values)} {series[-1]}"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _read_snapshot(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_snapshot(path, snapshot):
+    # A unique temporary file per write, so concurrent writers never
+    # replace each other's half-written snapshot
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f'{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def fold_worker_snapshot(metrics_dir, pid):
+    """
+    Merge an exited worker's snapshot into the exited-workers total
+
+    Called by the gunicorn master as each worker exits, so recycled
+    workers leave one aggregate file instead of a snapshot each.
+    """
+    path = os.path.join(metrics_dir, f'metrics-{pid}.json')
+    snapshot = _read_snapshot(path)
+    if snapshot is None:
+        return
+
+    exited_path = os.path.join(metrics_dir, EXITED_SNAPSHOT)
+    total = _read_snapshot(exited_path) or {}
+    for name, values in snapshot.items():
+        merged = {tuple(labels): value for labels, value in total.get(name, [])}
+        for labels, value in values:
+            labels = tuple(labels)
+            if labels not in merged:
+                merged[labels] = value
+            elif isinstance(value, list):
+                # Histogram series: bucket counts, sum, count
+                merged[labels] = [a + b for a, b in zip(merged[labels], value)]
+            else:
+                merged[labels] += value
+        total[name] = [[list(labels), value] for labels, value in merged.items()]
+
+    _write_snapshot(exited_path, total)
+    os.remove(path)
+
+
+class RequestMetrics:
+    """
+    Per-route request instrumentation exposed in Prometheus text format
+
+    Records latency, response size, status codes and database time and
+    query counts per request, labelled by blueprint, endpoint and method,
+    and serves them at /metrics.
+
+    Each process keeps its own registry. Under a multi-worker server set
+    METRICS_DIR to a directory shared by the workers: each worker then
+    writes a snapshot there at most every METRICS_FLUSH_INTERVAL seconds
+    and /metrics reports the sum over all workers. Exiting workers flush
+    a final snapshot, which the master folds into EXITED_SNAPSHOT (see
+    gunicorn.conf.py).
+    """
+
+    ROUTE_LABELS = ('blueprint', 'endpoint', 'method')
+
+    def __init__(self, app=None, db=None):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = 0.0
+        self.requests = Counter(
+            'http_requests_total', 'HTTP requests by route and status code',
+            self.ROUTE_LABELS + ('status',))
+        self.latency = Histogram(
+            'http_request_duration_seconds', 'Request latency',
+            self.ROUTE_LABELS, LATENCY_BUCKETS)
+        self.response_size = Histogram(
+            'http_response_size_bytes', 'Response body size as sent',
+            self.ROUTE_LABELS, SIZE_BUCKETS)
+        self.db_time = Histogram(
+            'http_request_db_seconds', 'Time spent in database statements per request',
+            self.ROUTE_LABELS, LATENCY_BUCKETS)
+        self.db_queries = Histogram(
+            'http_request_db_queries', 'Database statements per request',
+            self.ROUTE_LABELS, QUERY_BUCKETS)
+        self.metrics = [self.requests, self.latency, self.response_size, self.db_time, self.db_queries]
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        app.config.setdefault('METRICS_DIR', None)
+        app.config.setdefault('METRICS_FLUSH_INTERVAL', 5)
+
+        self.metrics_dir = app.config['METRICS_DIR']
+        self.flush_interval = app.config['METRICS_FLUSH_INTERVAL']
+        if self.metrics_dir:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+
+        app.before_request(self.start_request)
+        app.after_request(self.record_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+        app.extensions['request_metrics'] = self
+
+    def start_request(self):
+        g.metrics_started = time.perf_counter()
+        g.db_time = 0.0
+        g.db_queries = 0
+
+    def record_request(self, response):
+        started = g.get('metrics_started')
+        if started is None:
+            return response
+
+        endpoint = request.endpoint or 'unmatched'
+        route = (request.blueprint or '', endpoint, request.method)
+
+        with self._lock:
+            self.requests.inc(route + (str(response.status_code),))
+            self.latency.observe(route, time.perf_counter() - started)
+            self.db_time.observe(route, g.get('db_time', 0.0))
+            self.db_queries.observe(route, g.get('db_queries', 0))
+            # Streamed bodies (exports) have no length up front
+            if response.content_length is not None:
+                self.response_size.observe(route, response.content_length)
+
+        if self.metrics_dir and time.monotonic() - self._last_flush > self.flush_interval:
+            self.flush()
+        return response
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_app_context() and 'db_queries' in g:
+            g.db_time += time.perf_counter() - context._metrics_started
+            g.db_queries += 1
+
+    def snapshot(self):
+        """JSON-serializable copy of every metric's values"""
+        with self._lock:
+            return {
+                metric.name: [[list(labels), value] for labels, value in metric.values.items()]
+                for metric in self.metrics
+            }
+
+    def flush(self):
+        """
+        Write this worker's snapshot to METRICS_DIR
+
+        Runs after requests, so a failed write is logged rather than
+        raised: losing a snapshot must not fail the response.
+        """
+        path = os.path.join(self.metrics_dir, f'metrics-{os.getpid()}.json')
+        with self._flush_lock:
+            self._last_flush = time.monotonic()
+            try:
+                _write_snapshot(path, self.snapshot())
+            except OSError:
+                logger.exception('Could not write metrics snapshot %s', path)
+
+    def render(self):
+        """Prometheus text exposition of the (possibly merged) registry"""
+        if self.metrics_dir:
+            self.flush()
+            merged = {metric.name: metric.empty() for metric in self.metrics}
+            for path in glob.glob(os.path.join(self.metrics_dir, 'metrics-*.json')):
+                snapshot = _read_snapshot(path)
+                if snapshot is None:
+                    continue
+                for name, values in snapshot.items():
+                    if name in merged:
+                        merged[name].merge({tuple(labels): value for labels, value in values})
+            metrics = [merged[metric.name] for metric in self.metrics]
+        else:
+            metrics = self.metrics
+
+        lines = []
+        with self._lock:
+            for metric in metrics:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        return current_app.response_class(self.render(), content_type=PROMETHEUS_CONTENT_TYPE)
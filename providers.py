@@ -1,9 +1,18 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 import sys
 import os
 from datetime import datetime
 import uuid
 
+from app.services.http_cache import conditional, table_version, row_version
+from app.services.query_cache import cached_response
+from app.services.query_tracker import query_budget
+from app.services.exports import EXPORT_FORMATS, export_response
+from app.services.fuzzy import search_mode
+from app.services.bulk import (
+    get_bulk_items, existing_ids, write_in_chunks, item_result, bulk_response
+)
+
 # Add the current directory to Python path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
@@ -12,54 +21,126 @@ db = None
 ServiceProvider = None
 ExperienceLevel = None
 ServiceStatus = None
+provider_serializer = None
+provider_index = None
 
 providers_bp = Blueprint('providers', __name__)
 
+def _providers_version(**kwargs):
+    """Data version of the service providers table, for conditional GETs"""
+    return table_version(ServiceProvider, ServiceProvider.updated_at)
+
+def _provider_version(provider_id):
+    """Data version of a single service provider, for conditional GETs"""
+    return row_version(ServiceProvider, ServiceProvider.updated_at, provider_id)
+
+def _filtered_providers_query(args):
+    """Build the filtered, ordered providers query shared by listing and export"""
+    # Get query parameters
+    program = args.get('program')
+    state = args.get('state')
+    experience_level = args.get('experience')
+    status = args.get('status')
+    search = args.get('search')
+    
+    # Build query
+    query = ServiceProvider.query
+    
+    if program and program != 'all':
+        # Filter providers who work with this program type
+        query = query.filter(ServiceProvider.programs.contains([program]))
+    
+    if state and state != 'all':
+        query = query.filter(ServiceProvider.state == state)
+        
+    if experience_level and experience_level != 'all':
+        query = query.filter(ServiceProvider.experience_level == ExperienceLevel(experience_level))
+        
+    if status and status != 'all':
+        query = query.filter(ServiceProvider.status == ServiceStatus(status))
+        
+    if search:
+        search_term = f"%{search}%"
+        query = query.filter(
+            db.or_(
+                ServiceProvider.name.ilike(search_term),
+                ServiceProvider.bio.ilike(search_term),
+                ServiceProvider.location.ilike(search_term)
+            )
+        )
+    
+    # Order by rating (highest first), then by name
+    return query.order_by(ServiceProvider.rating.desc(), ServiceProvider.name)
+
 @providers_bp.route('/', methods=['GET'])
+@query_budget(2)
+@cached_response('service_providers')
+@conditional(_providers_version)
 def get_providers():
     """Get all service providers with optional filtering"""
     try:
-        # Get query parameters
-        program = request.args.get('program')
-        state = request.args.get('state')
-        experience_level = request.args.get('experience')
-        status = request.args.get('status')
-        search = request.args.get('search')
-        
-        # Build query
-        query = ServiceProvider.query
-        
-        if program and program != 'all':
-            # Filter providers who work with this program type
-            query = query.filter(ServiceProvider.programs.contains([program]))
-        
-        if state and state != 'all':
-            query = query.filter(ServiceProvider.state == state)
-            
-        if experience_level and experience_level != 'all':
-            query = query.filter(ServiceProvider.experience_level == ExperienceLevel(experience_level))
-            
-        if status and status != 'all':
-            query = query.filter(ServiceProvider.status == ServiceStatus(status))
-            
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                db.or_(
-                    ServiceProvider.name.ilike(search_term),
-                    ServiceProvider.bio.ilike(search_term),
-                    ServiceProvider.location.ilike(search_term)
-                )
-            )
+        # Sparse fieldsets: fields=a,b,c or view=summary, with long text
+        # optionally truncated server-side via truncate=N
+        try:
+            projection = provider_serializer.project_from_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        # search=... matches exact substrings, or tolerates typos and ranks
+        # the results with match=fuzzy
+        try:
+            mode = search_mode(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        if mode == 'fuzzy':
+            if provider_index is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Fuzzy search is disabled'
+                }), 400
+            rows = provider_index.query(request.args, projection)
+        else:
+            # Select only the projected columns so rows are encoded without
+            # building models
+            rows = _filtered_providers_query(request.args).with_entities(*projection.columns).all()
         
-        # Order by rating (highest first), then by name
-        providers = query.order_by(ServiceProvider.rating.desc(), ServiceProvider.name).all()
+        return Response(provider_serializer.encode_list(rows, 'providers', projection), mimetype='application/json')
         
+    except Exception as e:
         return jsonify({
-            'success': True,
-            'providers': [provider.to_dict() for provider in providers],
-            'count': len(providers)
-        })
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@providers_bp.route('/export', methods=['GET'])
+def export_providers():
+    """Stream all service providers matching the listing filters as NDJSON or CSV"""
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported export format "{export_format}"'
+            }), 400
+        
+        try:
+            projection = provider_serializer.project_from_args(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        query = _filtered_providers_query(request.args).with_entities(*projection.columns)
+        
+        return export_response(provider_serializer, query, projection, export_format, 'providers')
         
     except Exception as e:
         return jsonify({
@@ -68,6 +149,8 @@ def get_providers():
         }), 500
 
 @providers_bp.route('/<provider_id>', methods=['GET'])
+@query_budget(2)
+@conditional(_provider_version)
 def get_provider(provider_id):
     """Get a specific service provider by ID"""
     try:
@@ -119,6 +202,41 @@ def create_provider():
             'error': str(e)
         }), 500
 
+def _apply_provider_updates(provider, data):
+    """Apply a partial update payload to a service provider"""
+    # Update provider fields
+    for key, value in data.items():
+        if hasattr(provider, key) and key != 'id':
+            if key == 'experienceLevel' and value:
+                provider.experience_level = ExperienceLevel(value)
+            elif key == 'status' and value:
+                provider.status = ServiceStatus(value)
+            else:
+                snake_case_key = key.replace('Email', '_email').replace('Phone', '_phone')
+                setattr(provider, snake_case_key, value)
+    
+    provider.updated_at = datetime.utcnow()
+
+def _validate_provider_data(data, partial=False):
+    """Return the validation errors for a service provider payload"""
+    if not isinstance(data, dict):
+        return ['Item must be an object']
+    
+    errors = []
+    
+    if not partial and not data.get('name'):
+        errors.append('Missing required fields: name')
+    
+    for key, enum in (('experienceLevel', ExperienceLevel), ('status', ServiceStatus)):
+        value = data.get(key)
+        if value:
+            try:
+                enum(value)
+            except ValueError:
+                errors.append(f'Invalid {key} "{value}"')
+    
+    return errors
+
 @providers_bp.route('/<provider_id>', methods=['PUT'])
 def update_provider(provider_id):
     """Update an existing service provider"""
@@ -132,18 +250,7 @@ def update_provider(provider_id):
         
         data = request.get_json()
         
-        # Update provider fields
-        for key, value in data.items():
-            if hasattr(provider, key) and key != 'id':
-                if key == 'experienceLevel' and value:
-                    provider.experience_level = ExperienceLevel(value)
-                elif key == 'status' and value:
-                    provider.status = ServiceStatus(value)
-                else:
-                    snake_case_key = key.replace('Email', '_email').replace('Phone', '_phone')
-                    setattr(provider, snake_case_key, value)
-        
-        provider.updated_at = datetime.utcnow()
+        _apply_provider_updates(provider, data)
         db.session.commit()
         
         return jsonify({
@@ -185,22 +292,175 @@ def delete_provider(provider_id):
             'error': str(e)
         }), 500
 
+@providers_bp.route('/bulk', methods=['POST'])
+def bulk_create_providers():
+    """Create many service providers, validated up front and written in chunked transactions"""
+    try:
+        items, error = get_bulk_items(request.get_json(silent=True), 'providers')
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        results = [None] * len(items)
+        valid = []
+        seen_ids = set()
+        
+        for index, data in enumerate(items):
+            errors = _validate_provider_data(data)
+            if not errors:
+                # Generate ID if not provided
+                if not data.get('id'):
+                    data['id'] = f"provider-{str(uuid.uuid4())[:8]}"
+                if data['id'] in seen_ids:
+                    errors.append('Duplicate id in request')
+                seen_ids.add(data['id'])
+            
+            if errors:
+                item_id = data.get('id') if isinstance(data, dict) else None
+                results[index] = item_result(index, item_id, errors)
+            else:
+                valid.append((index, data))
+        
+        # Reject IDs that already exist with one query per chunk
+        taken = existing_ids(db.session, ServiceProvider, [data['id'] for _, data in valid])
+        if taken:
+            for index, data in valid:
+                if data['id'] in taken:
+                    results[index] = item_result(index, data['id'], ['Service provider already exists'])
+            valid = [(index, data) for index, data in valid if data['id'] not in taken]
+        
+        def create_chunk(chunk):
+            db.session.add_all([ServiceProvider.from_dict(data) for _, data in chunk])
+        
+        failures = write_in_chunks(db.session, valid, create_chunk)
+        
+        for index, data in valid:
+            results[index] = item_result(index, data['id'], [failures[index]] if index in failures else None)
+        
+        return bulk_response(results, 'Bulk service provider creation completed')
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@providers_bp.route('/bulk', methods=['PUT'])
+def bulk_update_providers():
+    """Update many service providers by ID, validated up front and written in chunked transactions"""
+    try:
+        items, error = get_bulk_items(request.get_json(silent=True), 'providers')
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        results = [None] * len(items)
+        valid = []
+        
+        for index, data in enumerate(items):
+            errors = _validate_provider_data(data, partial=True)
+            if not errors and not data.get('id'):
+                errors.append('Missing id')
+            
+            if errors:
+                item_id = data.get('id') if isinstance(data, dict) else None
+                results[index] = item_result(index, item_id, errors)
+            else:
+                valid.append((index, data))
+        
+        found = existing_ids(db.session, ServiceProvider, [data['id'] for _, data in valid])
+        for index, data in valid:
+            if data['id'] not in found:
+                results[index] = item_result(index, data['id'], ['Service provider not found'])
+        valid = [(index, data) for index, data in valid if data['id'] in found]
+        
+        def update_chunk(chunk):
+            # Load the whole chunk in one query
+            providers = {
+                provider.id: provider
+                for provider in ServiceProvider.query.filter(ServiceProvider.id.in_([data['id'] for _, data in chunk]))
+            }
+            for _, data in chunk:
+                _apply_provider_updates(providers[data['id']], data)
+        
+        failures = write_in_chunks(db.session, valid, update_chunk)
+        
+        for index, data in valid:
+            results[index] = item_result(index, data['id'], [failures[index]] if index in failures else None)
+        
+        return bulk_response(results, 'Bulk service provider update completed')
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@providers_bp.route('/bulk', methods=['DELETE'])
+def bulk_delete_providers():
+    """Delete many service providers by ID in chunked transactions"""
+    try:
+        ids, error = get_bulk_items(request.get_json(silent=True), 'ids')
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        found = existing_ids(db.session, ServiceProvider, ids)
+        valid = [(index, provider_id) for index, provider_id in enumerate(ids) if provider_id in found]
+        
+        def delete_chunk(chunk):
+            ServiceProvider.query.filter(
+                ServiceProvider.id.in_([provider_id for _, provider_id in chunk])
+            ).delete(synchronize_session=False)
+        
+        failures = write_in_chunks(db.session, valid, delete_chunk)
+        
+        results = []
+        for index, provider_id in enumerate(ids):
+            if provider_id not in found:
+                results.append(item_result(index, provider_id, ['Service provider not found']))
+            else:
+                results.append(item_result(index, provider_id, [failures[index]] if index in failures else None))
+        
+        return bulk_response(results, 'Bulk service provider deletion completed')
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @providers_bp.route('/stats', methods=['GET'])
+@query_budget(3)
+@conditional(_providers_version)
 def get_provider_stats():
     """Get service provider statistics"""
     try:
-        total_providers = ServiceProvider.query.count()
-        available_providers = ServiceProvider.query.filter(ServiceProvider.status == ServiceStatus.AVAILABLE).count()
+        # One pass for the totals, one GROUP BY for the per-level counts
+        total_providers, available_providers, avg_rating = db.session.query(
+            db.func.count(ServiceProvider.id),
+            db.func.count(db.case((ServiceProvider.status == ServiceStatus.AVAILABLE, 1))),
+            db.func.avg(ServiceProvider.rating)
+        ).one()
+        avg_rating = avg_rating or 0.0
         
-        # Providers by experience level
-        experience_levels = {}
-        for level in ExperienceLevel:
-            count = ServiceProvider.query.filter(ServiceProvider.experience_level == level).count()
+        # Providers by experience level; providers without one are only
+        # in the total
+        experience_levels = {level.value: 0 for level in ExperienceLevel}
+        for level, count in db.session.query(
+            ServiceProvider.experience_level, db.func.count(ServiceProvider.id)
+        ).filter(ServiceProvider.experience_level.isnot(None)).group_by(ServiceProvider.experience_level):
             experience_levels[level.value] = count
         
-        # Average rating
-        avg_rating = db.session.query(db.func.avg(ServiceProvider.rating)).scalar() or 0.0
-        
         return jsonify({
             'success': True,
             'stats': {
@@ -0,0 +1,196 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request
+from sqlalchemy import event
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is optional
+    redis = None
+
+
+class QueryCache:
+    """
+    Caches serialized list responses keyed on their query parameters
+
+    Every cached entry is tied to the data version of its table. Commits
+    that touch a table (route writes, bulk endpoints and scrape ingest
+    alike, since they all go through the same session) bump that table's
+    version, so stale listings are never served and hot ones are answered
+    without touching the database.
+
+    Set QUERY_CACHE_URL to a Redis-compatible server to share entries and
+    versions between worker processes. The in-process LRU
+    (QUERY_CACHE_SIZE entries) is off by default: each worker would only
+    see its own writes and keep serving other workers' stale listings, and
+    their ETags, for up to QUERY_CACHE_TTL seconds. Only enable it for a
+    single-process deployment.
+    """
+
+    def __init__(self, app=None, db=None):
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        app.config.setdefault('QUERY_CACHE_SIZE', 0)
+        app.config.setdefault('QUERY_CACHE_TTL', 60)
+        app.config.setdefault('QUERY_CACHE_URL', None)
+
+        self.size = app.config['QUERY_CACHE_SIZE']
+        self.ttl = app.config['QUERY_CACHE_TTL']
+
+        url = app.config['QUERY_CACHE_URL']
+        if url:
+            if redis is None:
+                raise RuntimeError('QUERY_CACHE_URL is set but the redis package is not installed')
+            self._redis = redis.Redis.from_url(url)
+        else:
+            self._redis = None
+
+        # Record which tables each transaction writes, bump them on commit
+        event.listen(db.session, 'after_flush', self._track_flush)
+        event.listen(db.session, 'do_orm_execute', self._track_bulk_write)
+        event.listen(db.session, 'after_commit', self._bump_written)
+        event.listen(db.session, 'after_rollback', self._discard_written)
+
+        app.extensions['query_cache'] = self
+
+    @property
+    def enabled(self):
+        return bool(self.size) or self._redis is not None
+
+    def version(self, table):
+        """Current data version of a table"""
+        if self._redis is not None:
+            return int(self._redis.get(f'query-cache:version:{table}') or 0)
+        return self._versions.get(table, 0)
+
+    def bump(self, table):
+        """Invalidate every cached response built from a table"""
+        self.stats['invalidations'] += 1
+        if self._redis is not None:
+            self._redis.incr(f'query-cache:version:{table}')
+            return
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def get(self, key):
+        """Return the cached (etag, mimetype, body) entry for a key, or None"""
+        if self._redis is not None:
+            raw = self._redis.get(key)
+            if raw is None:
+                return None
+            etag, mimetype, body = raw.split(b'\n', 2)
+            return etag.decode('utf-8'), mimetype.decode('utf-8'), body
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, etag, mimetype, body):
+        """Store a serialized response"""
+        if self._redis is not None:
+            raw = b'\n'.join([(etag or '').encode('utf-8'), mimetype.encode('utf-8'), body])
+            self._redis.set(key, raw, ex=self.ttl or None)
+            return
+
+        expires = time.monotonic() + self.ttl if self.ttl else float('inf')
+        with self._lock:
+            self._entries[key] = (expires, (etag or '', mimetype, body))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every locally cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def make_key(self, table):
+        """Cache key for the current request at the table's data version"""
+        # Views filter on the raw values, so ' TX' and 'TX' are different
+        # queries. Only the parameter order is normalized; repeated values
+        # keep theirs.
+        args = sorted(request.args.items(multi=True), key=lambda item: item[0])
+        digest = hashlib.sha1(f'{request.endpoint}|{args}'.encode('utf-8')).hexdigest()
+        return f'query-cache:{table}:{self.version(table)}:{digest}'
+
+    def _track_flush(self, session, flush_context):
+        tables = session.info.setdefault('query_cache_tables', set())
+        for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+            table = getattr(instance, '__tablename__', None)
+            if table:
+                tables.add(table)
+
+    def _track_bulk_write(self, orm_execute_state):
+        # Query.update() / Query.delete() and bulk inserts bypass the flush
+        if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+            table = getattr(orm_execute_state.statement, 'table', None)
+            if table is not None:
+                orm_execute_state.session.info.setdefault('query_cache_tables', set()).add(table.name)
+
+    def _bump_written(self, session):
+        for table in session.info.pop('query_cache_tables', ()):
+            self.bump(table)
+
+    def _discard_written(self, session):
+        session.info.pop('query_cache_tables', None)
+
+
+def cached_response(table):
+    """
+    Serve a GET view from the query cache while its table is unchanged
+
+    Only 200 responses are stored, together with the ETag set by
+    app.services.http_cache.conditional, so a hit also answers
+    If-None-Match without running the version query. Apply it above
+    @conditional.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = current_app.extensions.get('query_cache')
+            if cache is None or not cache.enabled:
+                return view(*args, **kwargs)
+
+            key = cache.make_key(table)
+            entry = cache.get(key)
+
+            if entry is None:
+                cache.stats['misses'] += 1
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    etag, _ = response.get_etag()
+                    cache.set(key, etag, response.mimetype, response.get_data())
+                response.headers['X-Cache'] = 'MISS'
+                return response
+
+            cache.stats['hits'] += 1
+            etag, mimetype, body = entry
+            if etag and request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.response_class(body, mimetype=mimetype)
+            if etag:
+                response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Cache'] = 'HIT'
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,208 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Scopes (requests, scrape tasks, test blocks) currently collecting queries
+_active_scopes = ContextVar('query_tracker_scopes', default=())
+
+# Expanded IN lists differ only in their placeholder count
+_IN_LIST = re.compile(r'\((?:\s*(?:\?|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+)\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request or block ran more SQL statements than it declared"""
+
+
+def normalize_statement(statement):
+    """Collapse whitespace and IN lists so repeated queries compare equal"""
+    return _IN_LIST.sub('(?)', _WHITESPACE.sub(' ', statement).strip())
+
+
+class QueryScope:
+    """Statements executed within one request, scrape task or test block"""
+
+    def __init__(self, name):
+        self.name = name
+        self.queries = []
+        self.total_time = 0.0
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def record(self, engine, statement, parameters, duration, executemany):
+        self.queries.append({
+            'engine': engine,
+            'statement': statement,
+            'parameters': parameters,
+            'duration': duration,
+            'executemany': executemany
+        })
+        self.total_time += duration
+
+    def repeated(self, threshold):
+        """Normalized statements run at least threshold times (likely N+1)"""
+        counts = Counter(normalize_statement(query['statement']) for query in self.queries)
+        return {statement: count for statement, count in counts.items() if count >= threshold}
+
+
+def explain(engine, statement, parameters):
+    """Query plan of a statement as text, using the dialect's EXPLAIN"""
+    prefix = 'EXPLAIN QUERY PLAN ' if engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    try:
+        with engine.connect().execution_options(query_tracker_skip=True) as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+    except Exception as e:
+        return f'(EXPLAIN failed: {e})'
+    return '\n'.join(' | '.join(str(value) for value in row) for row in rows)
+
+
+class QueryTracker:
+    """
+    Development and test instrumentation for SQL statement counts
+
+    When QUERY_TRACKING is enabled every statement is attributed to the
+    active scope: the current request, a scrape task wrapped in
+    track_queries(), or a test block. At the end of each scope it logs
+    statements repeated N_PLUS_ONE_THRESHOLD or more times, logs queries
+    slower than SLOW_QUERY_THRESHOLD seconds with their EXPLAIN plan, and
+    checks routes against the budget declared with @query_budget. Over
+    budget is an error log, or QueryBudgetExceeded when
+    QUERY_BUDGET_STRICT is set (the default under app.testing).
+
+    Disabled, it installs no listeners and costs nothing.
+    """
+
+    def __init__(self, app=None, db=None):
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        app.config.setdefault('QUERY_TRACKING', False)
+        app.config.setdefault('SLOW_QUERY_THRESHOLD', 0.1)
+        app.config.setdefault('N_PLUS_ONE_THRESHOLD', 5)
+        app.config.setdefault('QUERY_BUDGET_STRICT', None)
+
+        app.extensions['query_tracker'] = self
+        self.enabled = app.config['QUERY_TRACKING']
+        if not self.enabled:
+            return
+
+        self.slow_threshold = app.config['SLOW_QUERY_THRESHOLD']
+        self.n_plus_one_threshold = app.config['N_PLUS_ONE_THRESHOLD']
+
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        app.teardown_request(self.end_request)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._tracker_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        scopes = _active_scopes.get()
+        if not scopes or context.execution_options.get('query_tracker_skip'):
+            return
+        duration = time.perf_counter() - context._tracker_started
+        for scope in scopes:
+            scope.record(conn.engine, statement, parameters, duration, executemany)
+
+    def start_request(self):
+        scope = QueryScope(f'{request.method} {request.endpoint or request.path}')
+        g.query_scope = scope
+        g.query_scope_token = _active_scopes.set(_active_scopes.get() + (scope,))
+
+    def finish_request(self, response):
+        scope = g.get('query_scope')
+        if scope is None:
+            return response
+
+        response.headers['X-Query-Count'] = str(scope.count)
+        self.report(scope)
+
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', None)
+        if budget is not None and scope.count > budget:
+            self.over_budget(scope, budget)
+        return response
+
+    def end_request(self, exc=None):
+        token = g.pop('query_scope_token', None)
+        if token is not None:
+            _active_scopes.reset(token)
+
+    def report(self, scope):
+        """Log likely N+1 patterns and slow queries of a finished scope"""
+        for statement, count in scope.repeated(self.n_plus_one_threshold).items():
+            logger.warning('Possible N+1 in %s: statement ran %d times: %s', scope.name, count, statement)
+
+        for query in scope.queries:
+            if query['duration'] < self.slow_threshold:
+                continue
+            plan = ''
+            if not query['executemany'] and query['statement'].lstrip().upper().startswith(('SELECT', 'WITH')):
+                plan = explain(query['engine'], query['statement'], query['parameters'])
+            logger.warning('Slow query in %s (%.1f ms): %s\n%s',
+                           scope.name, query['duration'] * 1000, query['statement'], plan)
+
+        logger.debug('%s ran %d statements in %.1f ms', scope.name, scope.count, scope.total_time * 1000)
+
+    def over_budget(self, scope, budget):
+        message = f'{scope.name} ran {scope.count} SQL statements, budget is {budget}'
+        strict = current_app.config['QUERY_BUDGET_STRICT']
+        if strict is None:
+            strict = current_app.testing
+        if strict:
+            raise QueryBudgetExceeded(message)
+        logger.error(message)
+
+
+def query_budget(limit):
+    """Declare the most SQL statements a view may run per request"""
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+@contextmanager
+def track_queries(name):
+    """
+    Attribute the statements run inside the block to their own scope
+
+    Used for scrape tasks and tests. The block's statements are reported
+    like a request's when tracking is enabled; the scope is yielded so
+    callers can inspect scope.count and scope.queries.
+    """
+    scope = QueryScope(name)
+    token = _active_scopes.set(_active_scopes.get() + (scope,))
+    try:
+        yield scope
+    finally:
+        _active_scopes.reset(token)
+        tracker = current_app.extensions.get('query_tracker') if has_app_context() else None
+        if tracker is not None and tracker.enabled:
+            tracker.report(scope)
+
+
+@contextmanager
+def assert_max_queries(limit, name='block'):
+    """Fail with QueryBudgetExceeded if the block runs more than limit statements"""
+    with track_queries(name) as scope:
+        yield scope
+    if scope.count > limit:
+        statements = '\n'.join(query['statement'] for query in scope.queries)
+        raise QueryBudgetExceeded(f'{name} ran {scope.count} SQL statements, budget is {limit}:\n{statements}')
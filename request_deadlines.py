@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager
+
+from flask import g, has_app_context, request
+from sqlalchemy import event
+
+
+class RequestTimeout(Exception):
+    """Raised when a request keeps querying the database past its deadline"""
+
+
+def request_timed_out():
+    """Whether the current request has run past its deadline"""
+    return has_app_context() and g.get('request_timed_out', False)
+
+
+@contextmanager
+def deadline_suspended():
+    """
+    Run the block's statements even if the deadline has passed
+
+    For the bookkeeping a request does after being cut off, such as
+    recording that a scrape run was aborted.
+    """
+    if not has_app_context():
+        yield
+        return
+    previous = g.get('request_deadline_suspended', False)
+    g.request_deadline_suspended = True
+    try:
+        yield
+    finally:
+        g.request_deadline_suspended = previous
+
+
+class RequestDeadlines:
+    """
+    Per-route request time budgets
+
+    API routes get API_REQUEST_TIMEOUT seconds and scraper routes
+    SCRAPER_REQUEST_TIMEOUT. Python threads cannot be interrupted, so the
+    budget is enforced cooperatively: once it has passed, the request's
+    next database statement raises RequestTimeout and the response is
+    turned into a 503. A long scrape stops at its next job commit, records
+    the aborted run and resumes from its checkpoint on the following run.
+    """
+
+    def __init__(self, app=None, db=None):
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        app.config.setdefault('API_REQUEST_TIMEOUT', 30)
+        app.config.setdefault('SCRAPER_REQUEST_TIMEOUT', 900)
+        app.config.setdefault('SCRAPER_ROUTE_PREFIX', '/api/scraper')
+
+        self.api_timeout = app.config['API_REQUEST_TIMEOUT']
+        self.scraper_timeout = app.config['SCRAPER_REQUEST_TIMEOUT']
+        self.scraper_prefix = app.config['SCRAPER_ROUTE_PREFIX']
+
+        app.before_request(self.start_deadline)
+        app.after_request(self.flag_timeout)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self.check_deadline)
+
+    def timeout_for(self, path):
+        """Time budget in seconds for a request path"""
+        if path.startswith(self.scraper_prefix):
+            return self.scraper_timeout
+        return self.api_timeout
+
+    def start_deadline(self):
+        timeout = self.timeout_for(request.path)
+        if timeout:
+            g.request_timeout = timeout
+            g.request_deadline = time.monotonic() + timeout
+
+    def check_deadline(self, conn, cursor, statement, parameters, context, executemany):
+        if not has_app_context() or g.get('request_deadline_suspended'):
+            return
+        deadline = g.get('request_deadline')
+        if deadline is not None and time.monotonic() > deadline:
+            g.request_timed_out = True
+            raise RequestTimeout(f"Request exceeded its {g.request_timeout}s time limit")
+
+    def flag_timeout(self, response):
+        # Routes report their own errors as 500s; a blown budget is a 503
+        if g.get('request_timed_out'):
+            response.status_code = 503
+        return response
@@ -0,0 +1,531 @@
+import re
+import threading
+import time
+
+from sqlalchemy import event
+
+from app.services.fuzzy import TermIndex, max_edits
+from app.services.suggest import PrefixIndex
+
+# Search text is split into lowercase alphanumeric tokens
+TOKEN_PATTERN = re.compile(r'[0-9a-z]+')
+
+# LIKE wildcards in a search term only mean something to the database
+LIKE_WILDCARDS = ('%', '_')
+
+# Projections (fields/view/truncate combinations) whose rows are kept
+MAX_PROJECTED = 8
+
+# Fuzzy search points per term for an exact (substring) match, then for
+# one and two typos; rows containing the whole search text get one more
+FUZZY_WEIGHTS = (3, 2, 1)
+
+
+def _slots(bitmap):
+    """Set bit positions of an int bitmap, lowest first"""
+    flags = bin(bitmap)[:1:-1]
+    return [slot for slot, flag in enumerate(flags) if flag == '1']
+
+
+class RowIndex:
+    """
+    In-process index answering filtered, searched list queries from RAM
+
+    Holds every row of a RowSerializer's model as a full projection tuple.
+    Each row gets a slot, and each filter value and search token maps to a
+    bitmap of slots (a Python int), so a filter combination is a few big
+    integer ANDs. Search narrows candidates through the token inverted
+    index, then checks the exact substring the SQL ILIKE would, so results
+    match the database query. Fuzzy search (match=fuzzy) also accepts
+    vocabulary words a few typos away, found through a trigram index, and
+    ranks rows by how well they match.
+
+    Optional suggest_attrs keep a frequency-weighted PrefixIndex of
+    their values for search box completions.
+
+    Freshness:
+        Commits through the session are tracked like the query cache's:
+        changed rows are reloaded by primary key on the next read, and
+        bulk statements (Query.update/delete, bulk inserts) trigger a full
+        reconciliation. Writes made by other processes are picked up by a
+        full reconciliation every reconcile_interval seconds. A
+        reconciliation reads every row but only reindexes those that
+        changed.
+    """
+
+    def __init__(self, app, db, serializer, filters, text_attrs, order_by, suggest_attrs=(),
+                 reconcile_interval=30):
+        """
+        Args:
+            app: Flask app
+            db: Flask-SQLAlchemy extension whose session is tracked
+            serializer: RowSerializer of the indexed model
+            filters: Mapping of query parameter to (attribute, Enum class
+                or None) for the equality filters; list fields match rows
+                containing the value
+            text_attrs: Attributes matched by the search parameter
+            order_by: (attribute, descending) pairs listings are ordered by
+            suggest_attrs: Attributes whose values are offered as completions
+            reconcile_interval: Seconds between full rebuilds
+        """
+        self.db = db
+        self.serializer = serializer
+        self.model = serializer.model
+        self.filters = filters
+        self.reconcile_interval = reconcile_interval
+
+        full = serializer.full
+        positions = {attr: index for index, attr in enumerate(full.attrs)}
+        self._id_index = full.id_index
+        self._version_index = full.version_index
+        self._order_by = [(positions[attr], descending) for attr, descending in order_by]
+        self._filter_indexes = {name: positions[attr] for name, (attr, _) in filters.items()}
+        kinds = {attr: kind for _, attr, kind in serializer.fields}
+        self._list_filters = {name for name, (attr, _) in filters.items() if kinds.get(attr) == 'list'}
+
+        # Session bookkeeping keys of this index, so indexes (of other
+        # tables, or of other apps sharing the session) never take each
+        # other's writes
+        key = f'{self.model.__tablename__}:{id(self)}'
+        self._ids_key = f'row_index_ids:{key}'
+        self._stale_key = f'row_index_stale:{key}'
+        self._text_indexes = [positions[attr] for attr in text_attrs]
+        self._suggest_indexes = {attr: positions[attr] for attr in suggest_attrs}
+
+        self._lock = threading.RLock()
+        self._pending_ids = set()
+        self._stale = True
+        self._built_at = 0.0
+        self._projectors = {}
+        self.stats = {'queries': 0, 'rebuilds': 0, 'reloads': 0}
+        self._reset()
+
+        event.listen(db.session, 'after_flush', self._track_flush)
+        event.listen(db.session, 'do_orm_execute', self._track_bulk_write)
+        event.listen(db.session, 'after_commit', self._apply_written)
+        event.listen(db.session, 'after_rollback', self._discard_written)
+
+        app.extensions.setdefault('row_indexes', {})[self.model.__tablename__] = self
+
+    def _reset(self):
+        self._rows = []
+        self._texts = []
+        self._slot_by_id = {}
+        self._free_slots = []
+        self._live = 0
+        self._values = {name: {} for name in self.filters}
+        self._tokens = {}
+        self._terms = TermIndex()
+        self.suggestions = {attr: PrefixIndex() for attr in self._suggest_indexes}
+        self._token_memo = {}
+        self._fuzzy_memo = {}
+        self._projected = {}
+        self._order = None
+        self._rank = None
+        self._version = None
+
+    # Write tracking
+
+    def _track_flush(self, session, flush_context):
+        ids = session.info.setdefault(self._ids_key, set())
+        for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+            if isinstance(instance, self.model):
+                ids.add(instance.id)
+
+    def _track_bulk_write(self, orm_execute_state):
+        if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+            table = getattr(orm_execute_state.statement, 'table', None)
+            if table is not None and table.name == self.model.__tablename__:
+                orm_execute_state.session.info[self._stale_key] = True
+
+    def _apply_written(self, session):
+        ids = session.info.pop(self._ids_key, set())
+        stale = session.info.pop(self._stale_key, False)
+        with self._lock:
+            if not self._stale:
+                # Rows written before the first build are loaded by it
+                self._pending_ids.update(ids)
+            self._stale = self._stale or stale
+
+    def _discard_written(self, session):
+        session.info.pop(self._ids_key, None)
+        session.info.pop(self._stale_key, None)
+
+    def invalidate(self):
+        """Force a full rebuild on the next read"""
+        with self._lock:
+            self._stale = True
+
+    # Maintenance
+
+    def _refresh(self):
+        """Bring the index up to date before a read (lock held)"""
+        if self._stale or time.monotonic() - self._built_at > self.reconcile_interval:
+            self._rebuild()
+        elif self._pending_ids:
+            self._reload(self._pending_ids)
+
+    def _rebuild(self):
+        rows = self.model.query.with_entities(*self.serializer.columns).all()
+        seen = set()
+        for row in rows:
+            row = tuple(row)
+            row_id = row[self._id_index]
+            seen.add(row_id)
+            slot = self._slot_by_id.get(row_id)
+            if slot is not None:
+                if self._rows[slot] == row:
+                    continue
+                self._remove(row_id)
+            self._insert(row)
+        for row_id in [row_id for row_id in self._slot_by_id if row_id not in seen]:
+            self._remove(row_id)
+        self._pending_ids.clear()
+        self._stale = False
+        self._built_at = time.monotonic()
+        self.stats['rebuilds'] += 1
+
+    def _reload(self, ids):
+        ids = list(ids)
+        rows = self.model.query.with_entities(*self.serializer.columns).filter(self.model.id.in_(ids)).all()
+        found = {}
+        for row in rows:
+            found[row[self._id_index]] = tuple(row)
+        for row_id in ids:
+            self._remove(row_id)
+            if row_id in found:
+                self._insert(found[row_id])
+        self._pending_ids.clear()
+        self.stats['reloads'] += 1
+
+    def _insert(self, row):
+        slot = self._free_slots.pop() if self._free_slots else len(self._rows)
+        if slot == len(self._rows):
+            self._rows.append(row)
+            self._texts.append(None)
+            for projected in self._projected.values():
+                projected.append(None)
+        else:
+            self._rows[slot] = row
+            for projected in self._projected.values():
+                projected[slot] = None
+
+        bit = 1 << slot
+        self._slot_by_id[row[self._id_index]] = slot
+        self._live |= bit
+
+        for name, index in self._filter_indexes.items():
+            values = self._values[name]
+            for value in self._filter_values(name, row[index]):
+                values[value] = values.get(value, 0) | bit
+
+        text = '\x00'.join((row[index] or '').lower() for index in self._text_indexes)
+        self._texts[slot] = text
+        for token in set(TOKEN_PATTERN.findall(text)):
+            if token not in self._tokens:
+                self._tokens[token] = 0
+                self._terms.add(token)
+            self._tokens[token] |= bit
+
+        for attr, index in self._suggest_indexes.items():
+            self.suggestions[attr].add(row[index])
+
+        self._changed()
+
+    def _remove(self, row_id):
+        slot = self._slot_by_id.pop(row_id, None)
+        if slot is None:
+            return
+        row = self._rows[slot]
+        mask = ~(1 << slot)
+        self._live &= mask
+
+        for name, index in self._filter_indexes.items():
+            values = self._values[name]
+            for value in self._filter_values(name, row[index]):
+                remaining = values.get(value, 0) & mask
+                if remaining:
+                    values[value] = remaining
+                else:
+                    values.pop(value, None)
+
+        for token in set(TOKEN_PATTERN.findall(self._texts[slot])):
+            remaining = self._tokens.get(token, 0) & mask
+            if remaining:
+                self._tokens[token] = remaining
+            elif token in self._tokens:
+                del self._tokens[token]
+                self._terms.remove(token)
+
+        for attr, index in self._suggest_indexes.items():
+            self.suggestions[attr].remove(row[index])
+
+        self._rows[slot] = None
+        self._texts[slot] = None
+        for projected in self._projected.values():
+            projected[slot] = None
+        self._free_slots.append(slot)
+        self._changed()
+
+    def _filter_values(self, name, value):
+        """Values a row is indexed under for a filter"""
+        if name in self._list_filters:
+            return [item for item in value or () if isinstance(item, str)]
+        return [value]
+
+    def _changed(self):
+        self._token_memo = {}
+        self._fuzzy_memo = {}
+        self._order = None
+        self._rank = None
+        self._version = None
+
+    # Queries
+
+    def _token_bitmap(self, token):
+        """Rows having a token that contains the given one"""
+        bitmap = self._token_memo.get(token)
+        if bitmap is None:
+            bitmap = 0
+            for indexed, rows in self._tokens.items():
+                if token in indexed:
+                    bitmap |= rows
+            self._token_memo[token] = bitmap
+        return bitmap
+
+    def _search_bitmap(self, search):
+        """Rows whose text attributes contain the search term, like ILIKE"""
+        needle = search.lower()
+        candidates = self._live
+        # A token of the term always lies inside some token of a match
+        for token in set(TOKEN_PATTERN.findall(needle)):
+            candidates &= self._token_bitmap(token)
+            if not candidates:
+                return 0
+
+        matches = 0
+        for slot in _slots(candidates):
+            if needle in self._texts[slot]:
+                matches |= 1 << slot
+        return matches
+
+    def _fuzzy_tiers(self, token):
+        """Bitmaps of rows matching a token exactly, then with one and two typos"""
+        tiers = self._fuzzy_memo.get(token)
+        if tiers is None:
+            tiers = [self._token_bitmap(token)] + [0] * max_edits(token)
+            for word, edits in self._terms.similar(token).items():
+                tiers[edits] |= self._tokens[word]
+            self._fuzzy_memo[token] = tiers
+        return tiers
+
+    def _fuzzy_search(self, search):
+        """
+        Rows matching every search token, allowing typos
+
+        Returns:
+            (bitmap, {slot: score}) with higher scores for closer matches
+        """
+        needle = search.lower()
+        tokens = list(dict.fromkeys(TOKEN_PATTERN.findall(needle)))
+        if not tokens:
+            return self._search_bitmap(search), None
+
+        matches = self._live
+        token_tiers = []
+        for token in tokens:
+            tiers = self._fuzzy_tiers(token)
+            union = 0
+            for bitmap in tiers:
+                union |= bitmap
+            matches &= union
+            token_tiers.append(tiers)
+        if not matches:
+            return 0, None
+
+        scores = dict.fromkeys(_slots(matches), 0)
+        for tiers in token_tiers:
+            remaining = matches
+            for weight, bitmap in zip(FUZZY_WEIGHTS, tiers):
+                hits = bitmap & remaining
+                for slot in _slots(hits):
+                    scores[slot] += weight
+                remaining &= ~hits
+        for slot in scores:
+            if needle in self._texts[slot]:
+                scores[slot] += 1
+        return matches, scores
+
+    def _filter_bitmaps(self, args):
+        """
+        Bitmap of each active filter, keyed like the query parameters
+
+        Returns:
+            (bitmaps, scores): mapping of name to bitmap, and the fuzzy
+            search score of each matching slot (None unless match=fuzzy);
+            None if the index cannot answer
+
+        Raises:
+            ValueError: If an enum filter value is invalid
+        """
+        bitmaps = {}
+        for name, (_, enum_class) in self.filters.items():
+            value = args.get(name)
+            if value and value != 'all':
+                key = enum_class(value) if enum_class else value
+                bitmaps[name] = self._values[name].get(key, 0)
+
+        scores = None
+        search = args.get('search')
+        if search:
+            if args.get('match') == 'fuzzy':
+                bitmaps['search'], scores = self._fuzzy_search(search)
+            elif any(wildcard in search for wildcard in LIKE_WILDCARDS):
+                return None
+            else:
+                bitmaps['search'] = self._search_bitmap(search)
+        return bitmaps, scores
+
+    def _ordered_slots(self, bitmap):
+        """Slots of a bitmap in listing order"""
+        if self._order is None:
+            # Stable sorts from the last key to the first; NULLs sort
+            # lowest, as in SQLite
+            order = _slots(self._live)
+            for index, descending in reversed(self._order_by):
+                order.sort(
+                    key=lambda slot: (self._rows[slot][index] is not None, self._rows[slot][index]),
+                    reverse=descending
+                )
+            self._order = order
+            self._rank = [0] * len(self._rows)
+            for rank, slot in enumerate(self._order):
+                self._rank[slot] = rank
+        if bitmap == self._live:
+            return self._order
+        return sorted(_slots(bitmap), key=self._rank.__getitem__)
+
+    def _projector(self, projection):
+        """Function mapping full rows to a projection's row shape"""
+        projector = self._projectors.get(projection.tag)
+        if projector is None:
+            full_positions = {attr: index for index, attr in enumerate(self.serializer.full.attrs)}
+            fields = []
+            for position, attr in enumerate(projection.attrs):
+                key = projection.keys[position] if position < len(projection.keys) else None
+                truncate = projection.truncate if key in self.serializer.truncatable else None
+                fields.append((full_positions[attr], truncate))
+
+            def projector(row):
+                return tuple(
+                    row[index][:truncate] if truncate and row[index] is not None else row[index]
+                    for index, truncate in fields
+                )
+            self._projectors[projection.tag] = projector
+        return projector
+
+    def query(self, args, projection=None):
+        """
+        Rows for list query parameters, ordered like the SQL listing
+
+        Args:
+            args: Request arguments with the filter and search parameters
+            projection: Projection to shape rows for; defaults to all fields
+
+        Returns:
+            List of projected row tuples, best matches first for fuzzy
+            searches; None when the query has to go to the database
+            (exact search terms with LIKE wildcards)
+        """
+        projection = projection or self.serializer.full
+        with self._lock:
+            self._refresh()
+            filtered = self._filter_bitmaps(args)
+            if filtered is None:
+                return None
+            bitmaps, scores = filtered
+
+            matches = self._live
+            for bitmap in bitmaps.values():
+                matches &= bitmap
+
+            slots = self._ordered_slots(matches)
+            if scores:
+                slots = sorted(slots, key=lambda slot: -scores[slot])
+            self.stats['queries'] += 1
+
+            if projection is self.serializer.full:
+                return [self._rows[slot] for slot in slots]
+
+            # Projected rows are kept per slot until the row changes
+            projected = self._projected.get(projection.tag)
+            if projected is None:
+                if len(self._projected) >= MAX_PROJECTED:
+                    self._projected.pop(next(iter(self._projected)))
+                projected = self._projected[projection.tag] = [None] * len(self._rows)
+            project = self._projector(projection)
+            rows = []
+            for slot in slots:
+                row = projected[slot]
+                if row is None:
+                    row = projected[slot] = project(self._rows[slot])
+                rows.append(row)
+            return rows
+
+    def facet_counts(self, args, names):
+        """
+        Per-value counts of filter dimensions, like app.services.facets
+
+        Returns:
+            {facet: {value: count}}, or None when the query has to go to
+            the database
+        """
+        with self._lock:
+            self._refresh()
+            filtered = self._filter_bitmaps(args)
+            if filtered is None:
+                return None
+            bitmaps, _ = filtered
+
+            counts = {}
+            for name in names:
+                base = self._live
+                for other, bitmap in bitmaps.items():
+                    if other != name:
+                        base &= bitmap
+
+                enum_class = self.filters[name][1]
+                facet = {member.value: 0 for member in enum_class} if enum_class else {}
+                for value, bitmap in self._values[name].items():
+                    if value is None:
+                        continue
+                    count = (bitmap & base).bit_count()
+                    if count or enum_class:
+                        facet[value.value if enum_class else value] = count
+                counts[name] = facet
+            return counts
+
+    def suggest(self, prefix, attrs, limit):
+        """
+        Most frequent values of each attribute with a word starting with prefix
+
+        Returns:
+            {attribute: [{'value': value, 'count': rows}]}
+        """
+        with self._lock:
+            self._refresh()
+            return {
+                attr: [{'value': value, 'count': count}
+                       for value, count in self.suggestions[attr].complete(prefix, limit)]
+                for attr in attrs
+            }
+
+    def version(self):
+        """Table version string matching app.services.http_cache.table_version"""
+        with self._lock:
+            self._refresh()
+            if self._version is None:
+                versions = [self._rows[slot][self._version_index] for slot in self._slot_by_id.values()]
+                latest = max((version for version in versions if version is not None), default=None)
+                self._version = f"{len(self._slot_by_id)}:{latest.isoformat() if latest else ''}"
+            return self._version
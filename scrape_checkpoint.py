@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class CheckpointStore:
+    """
+    Local JSON-file store for scrape sweep checkpoints, keyed by source.
+
+    The whole file is rewritten atomically on every save so a crash while
+    writing never leaves a half-written checkpoint behind.
+    """
+
+    def __init__(self, path='scrape_checkpoints.json'):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Read all checkpoints from disk"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A corrupt checkpoint only costs us a full re-scrape
+            return {}
+
+    def _write(self, data):
+        """Atomically replace the checkpoint file"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, source, keywords):
+        """
+        Get the checkpoint for a source
+
+        Args:
+            source: Scraper source name (e.g., 'edjoin')
+            keywords: Keyword list the sweep will run over
+
+        Returns:
+            ScrapeCheckpoint, starting fresh if none is stored or the
+            stored one was taken with a different keyword list
+        """
+        with self._lock:
+            state = self._load().get(source)
+
+        if not state or state.get('keywords') != list(keywords):
+            state = None
+
+        return ScrapeCheckpoint(self, source, keywords, state)
+
+    def save(self, checkpoint):
+        """Persist a single source's checkpoint"""
+        with self._lock:
+            data = self._load()
+            data[checkpoint.source] = checkpoint.to_dict()
+            self._write(data)
+
+    def clear(self, source):
+        """Remove a source's checkpoint once its sweep has completed"""
+        with self._lock:
+            data = self._load()
+            if data.pop(source, None) is not None:
+                self._write(data)
+
+
+class ScrapeCheckpoint:
+    """
+    Progress of one source's sweep: keyword index, result page cursor and
+    the posting IDs that have already been stored.
+    """
+
+    def __init__(self, store, source, keywords, state=None):
+        state = state or {}
+        self.store = store
+        self.source = source
+        self.keywords = list(keywords)
+        self.keyword_index = state.get('keyword_index', 0)
+        self.page = state.get('page', 1)
+        self.completed_ids = set(state.get('completed_ids', []))
+        self.updated_at = state.get('updated_at')
+
+    @property
+    def resumed(self):
+        """Whether this checkpoint carries progress from an earlier run"""
+        return self.updated_at is not None
+
+    def start_keyword(self, index):
+        """Move the cursor to a keyword, resetting the page unless resuming it"""
+        if index != self.keyword_index:
+            self.keyword_index = index
+            self.page = 1
+            self.save()
+
+    def set_page(self, page):
+        """Record the result page currently being read"""
+        if page != self.page:
+            self.page = page
+            self.save()
+
+    def is_completed(self, job_id):
+        """Check whether a posting was already stored by this sweep"""
+        return job_id in self.completed_ids
+
+    def mark_completed(self, job_id):
+        """Record that a posting has been stored"""
+        if job_id not in self.completed_ids:
+            self.completed_ids.add(job_id)
+            self.save()
+
+    def save(self):
+        """Persist the checkpoint"""
+        self.updated_at = datetime.utcnow().isoformat()
+        self.store.save(self)
+
+    def clear(self):
+        """Drop the checkpoint after a completed sweep"""
+        self.keyword_index = 0
+        self.page = 1
+        self.completed_ids = set()
+        self.updated_at = None
+        self.store.clear(self.source)
+
+    def to_dict(self):
+        return {
+            'keywords': self.keywords,
+            'keyword_index': self.keyword_index,
+            'page': self.page,
+            'completed_ids': sorted(self.completed_ids),
+            'updated_at': self.updated_at
+        }
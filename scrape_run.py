@@ -0,0 +1,89 @@
+from datetime import datetime
+from enum import Enum
+
+from app.extensions import db
+
+class ScrapeRunStatus(Enum):
+    RUNNING = "Running"
+    COMPLETED = "Completed"
+    FAILED = "Failed"
+
+class ScrapeRun(db.Model):
+    """One scraper run of one source, written by JobScraper.scrape_jobs"""
+    __tablename__ = 'scrape_runs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(50), nullable=False, index=True)
+    status = db.Column(db.Enum(ScrapeRunStatus), nullable=False, default=ScrapeRunStatus.RUNNING)
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    finished_at = db.Column(db.DateTime)
+    
+    # Results
+    new_jobs = db.Column(db.Integer, default=0)
+    updated_jobs = db.Column(db.Integer, default=0)
+    processed = db.Column(db.Integer, default=0)
+    resumed = db.Column(db.Boolean, default=False)
+    error = db.Column(db.Text)
+    
+    # Where the time went (see app.services.scrape_telemetry)
+    duration_seconds = db.Column(db.Float)
+    fetch_seconds = db.Column(db.Float)
+    parse_seconds = db.Column(db.Float)
+    sleep_seconds = db.Column(db.Float)
+    store_seconds = db.Column(db.Float)
+    requests = db.Column(db.Integer)
+    bytes = db.Column(db.Integer)
+    telemetry = db.Column(db.JSON)  # Full ScrapeTelemetry.to_dict() of the run
+    
+    def finish(self, results):
+        """Record a source's results and telemetry and close the run"""
+        telemetry = results.get('telemetry') or {}
+        seconds = telemetry.get('seconds', {})
+        
+        self.finished_at = datetime.utcnow()
+        self.status = ScrapeRunStatus.FAILED if results.get('error') else ScrapeRunStatus.COMPLETED
+        self.new_jobs = results.get('new_jobs', 0)
+        self.updated_jobs = results.get('updated_jobs', 0)
+        self.processed = results.get('total_processed', 0)
+        self.resumed = results.get('resumed', False)
+        self.error = results.get('error')
+        self.duration_seconds = (self.finished_at - self.started_at).total_seconds()
+        self.fetch_seconds = seconds.get('fetch')
+        self.parse_seconds = seconds.get('parse')
+        self.sleep_seconds = seconds.get('sleep')
+        self.store_seconds = seconds.get('store')
+        self.requests = telemetry.get('requests')
+        self.bytes = telemetry.get('bytes')
+        self.telemetry = telemetry or None
+    
+    @property
+    def jobs_per_minute(self):
+        """Stored (new plus updated) jobs per minute of run time"""
+        if not self.duration_seconds:
+            return None
+        return round((self.new_jobs + self.updated_jobs) * 60 / self.duration_seconds, 2)
+    
+    def to_dict(self, include_telemetry=False):
+        data = {
+            'id': self.id,
+            'source': self.source,
+            'status': self.status.value if self.status else None,
+            'startedAt': self.started_at.isoformat() if self.started_at else None,
+            'finishedAt': self.finished_at.isoformat() if self.finished_at else None,
+            'newJobs': self.new_jobs,
+            'updatedJobs': self.updated_jobs,
+            'processed': self.processed,
+            'resumed': self.resumed,
+            'error': self.error,
+            'durationSeconds': self.duration_seconds,
+            'fetchSeconds': self.fetch_seconds,
+            'parseSeconds': self.parse_seconds,
+            'sleepSeconds': self.sleep_seconds,
+            'storeSeconds': self.store_seconds,
+            'requests': self.requests,
+            'bytes': self.bytes,
+            'jobsPerMinute': self.jobs_per_minute
+        }
+        if include_telemetry:
+            data['telemetry'] = self.telemetry
+        return data
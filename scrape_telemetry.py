@@ -0,0 +1,98 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Extracted fields whose hit rates are tracked, and the job_data keys that
+# count as the field being found
+TRACKED_FIELDS = {
+    'title': ('title',),
+    'organization': ('organization',),
+    'location': ('location',),
+    'deadline': ('deadline',),
+    'posted_date': ('postedDate',),
+    'salary': ('compensation',),
+    'description': ('description',),
+    'contact': ('contactEmail', 'contactPhone')
+}
+
+# Phases a sweep's wall time is split into
+PHASES = ('sleep', 'fetch', 'parse', 'store')
+
+
+class ScrapeTelemetry:
+    """
+    Counters for one scraper run: where the time went, what came over the
+    wire and how often each field was extracted.
+
+    Time is split into rate limit sleeps, network waits, HTML parsing and
+    storing results; whatever is left of the run's duration is reported
+    as 'other'.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.utcnow()
+        self._started = time.perf_counter()
+        self.seconds = {phase: 0.0 for phase in PHASES}
+        self.requests = 0
+        self.failed_requests = 0
+        self.bytes = 0
+        self.status_codes = {}
+        self.cache_hits = 0
+        self.skipped_postings = 0
+        self.postings_parsed = 0
+        self.field_hits = {field: 0 for field in TRACKED_FIELDS}
+
+    @contextmanager
+    def timer(self, phase):
+        """Add the time spent in the block to a phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[phase] += time.perf_counter() - started
+
+    def record_response(self, response):
+        """Count a completed HTTP response, successful or not"""
+        self.requests += 1
+        self.bytes += len(response.content)
+        status = str(response.status_code)
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        # requests-cache marks the responses it served; 304s are revalidations
+        if getattr(response, 'from_cache', False) or response.status_code == 304:
+            self.cache_hits += 1
+
+    def record_failure(self):
+        """Count a request that got no response at all (timeout, DNS, reset)"""
+        self.requests += 1
+        self.failed_requests += 1
+
+    def record_fields(self, job_data):
+        """Count which tracked fields were extracted for a posting"""
+        self.postings_parsed += 1
+        for field, keys in TRACKED_FIELDS.items():
+            if any(job_data.get(key) for key in keys):
+                self.field_hits[field] += 1
+
+    def to_dict(self):
+        duration = time.perf_counter() - self._started
+        return {
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.utcnow().isoformat(),
+            'duration_seconds': round(duration, 3),
+            'seconds': {
+                **{phase: round(seconds, 3) for phase, seconds in self.seconds.items()},
+                'other': round(max(duration - sum(self.seconds.values()), 0.0), 3)
+            },
+            'requests': self.requests,
+            'failed_requests': self.failed_requests,
+            'bytes': self.bytes,
+            'status_codes': dict(sorted(self.status_codes.items())),
+            'cache_hits': self.cache_hits,
+            'skipped_postings': self.skipped_postings,
+            'postings_parsed': self.postings_parsed,
+            'field_hit_rates': {
+                field: round(hits / self.postings_parsed, 3) if self.postings_parsed else None
+                for field, hits in self.field_hits.items()
+            }
+        }
+
@@ -9,7 +9,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 # These will be injected from app.py
 db = None
 Job = None
-JobScraper = None
+ScrapeRun = None
+ScrapeRunStatus = None
+
+# Returns the JobScraper class. Injected from app.py so the scraper stack
+# (requests, BeautifulSoup, site scrapers) is only imported once a scraper
+# route is actually used
+load_job_scraper = None
 
 scraper_bp = Blueprint('scraper', __name__)
 
@@ -17,25 +23,41 @@ scraper_bp = Blueprint('scraper', __name__)
 def get_scraper_status():
     """Get the current status of the job scraper"""
     try:
-        # Get last scrape information
-        last_job = Job.query.order_by(Job.scraped_at.desc()).first()
-        last_scrape = last_job.scraped_at if last_job else None
+        JobScraper = load_job_scraper()
+        scraper = JobScraper()
+        
+        # Latest run of each source, read from the small scrape_runs table
+        latest_ids = db.session.query(
+            db.func.max(ScrapeRun.id)
+        ).group_by(ScrapeRun.source).scalar_subquery()
+        last_runs = ScrapeRun.query.filter(ScrapeRun.id.in_(latest_ids)).all()
+        
+        finished = [run.finished_at for run in last_runs if run.finished_at]
+        last_scrape = max(finished) if finished else None
         
-        # Get counts by source
+        # Stored jobs per source, from the index on jobs.source_site
         sources = db.session.query(
             Job.source_site,
-            db.func.count(Job.id).label('count')
+            db.func.count().label('count')
         ).group_by(Job.source_site).all()
         
         source_counts = {source[0]: source[1] for source in sources if source[0]}
         
+        # Jobs added by each source's recorded runs, including any since cleaned up
+        run_totals = db.session.query(
+            ScrapeRun.source,
+            db.func.sum(ScrapeRun.new_jobs).label('count')
+        ).group_by(ScrapeRun.source).all()
+        
         return jsonify({
             'success': True,
             'status': {
                 'last_scrape': last_scrape.isoformat() if last_scrape else None,
                 'total_scraped_jobs': Job.query.filter(Job.source_url.isnot(None)).count(),
                 'sources': source_counts,
-                'available_scrapers': JobScraper.get_available_scrapers()
+                'jobs_added_by_runs': {source: count or 0 for source, count in run_totals},
+                'available_scrapers': scraper.get_available_scrapers(),
+                'last_runs': {run.source: run.to_dict(include_telemetry=True) for run in last_runs}
             }
         })
         
@@ -45,6 +67,63 @@ def get_scraper_status():
             'error': str(e)
         }), 500
 
+@scraper_bp.route('/runs', methods=['GET'])
+def get_scrape_runs():
+    """Get scrape run history, newest first"""
+    try:
+        source = request.args.get('source')
+        status = request.args.get('status')
+        limit = min(request.args.get('limit', 20, type=int), 500)
+        include_telemetry = request.args.get('telemetry', 'false').lower() == 'true'
+        
+        query = ScrapeRun.query
+        if source:
+            query = query.filter(ScrapeRun.source == source)
+        if status:
+            try:
+                query = query.filter(ScrapeRun.status == ScrapeRunStatus(status))
+            except ValueError:
+                return jsonify({
+                    'success': False,
+                    'error': f'Invalid status "{status}"'
+                }), 400
+        
+        runs = query.order_by(ScrapeRun.id.desc()).limit(limit).all()
+        
+        return jsonify({
+            'success': True,
+            'runs': [run.to_dict(include_telemetry=include_telemetry) for run in runs],
+            'count': len(runs)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@scraper_bp.route('/runs/<int:run_id>', methods=['GET'])
+def get_scrape_run(run_id):
+    """Get a single scrape run with its full telemetry"""
+    try:
+        run = ScrapeRun.query.get(run_id)
+        if not run:
+            return jsonify({
+                'success': False,
+                'error': 'Scrape run not found'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'run': run.to_dict(include_telemetry=True)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @scraper_bp.route('/run', methods=['POST'])
 def run_scraper():
     """Manually trigger the job scraper"""
@@ -52,9 +131,12 @@ def run_scraper():
         data = request.get_json() or {}
         sources = data.get('sources', ['all'])  # Default to all sources
         max_jobs = data.get('max_jobs', 50)     # Limit to prevent overload
+        resume = data.get('resume', True)       # Continue an interrupted sweep
+        batched = data.get('batched', False)    # Combine keywords into fewer searches
         
+        JobScraper = load_job_scraper()
         scraper = JobScraper()
-        results = scraper.scrape_jobs(sources=sources, max_jobs=max_jobs)
+        results = scraper.scrape_jobs(sources=sources, max_jobs=max_jobs, resume=resume, batched=batched)
         
         return jsonify({
             'success': True,
@@ -72,6 +154,7 @@ def run_scraper():
 def test_scraper(source):
     """Test a specific scraper source"""
     try:
+        JobScraper = load_job_scraper()
         scraper = JobScraper()
         
         if not scraper.is_source_available(source):
@@ -95,6 +178,34 @@ def test_scraper(source):
             'error': str(e)
         }), 500
 
+@scraper_bp.route('/coverage/<source>', methods=['GET'])
+def compare_search_modes(source):
+    """Compare batched and per-keyword search coverage for a source"""
+    try:
+        JobScraper = load_job_scraper()
+        scraper = JobScraper()
+        
+        if not scraper.is_source_available(source):
+            return jsonify({
+                'success': False,
+                'error': f'Scraper source "{source}" is not available'
+            }), 400
+        
+        max_jobs = request.args.get('max_jobs', 5, type=int)
+        report = scraper.compare_search_modes(source, max_jobs=max_jobs)
+        
+        return jsonify({
+            'success': 'error' not in report,
+            'source': source,
+            'coverage_report': report
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @scraper_bp.route('/clean', methods=['POST'])
 def clean_old_jobs():
     """Clean up old or expired job postings"""
@@ -138,6 +249,7 @@ def clean_old_jobs():
 def get_scraper_sources():
     """Get available scraper sources and their configurations"""
     try:
+        JobScraper = load_job_scraper()
         scraper = JobScraper()
         sources = scraper.get_source_configs()
         
@@ -0,0 +1,156 @@
+import base64
+import hashlib
+import json
+import os
+import time
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+
+class FixtureAdapter(BaseAdapter):
+    """
+    Transport adapter that records scraper responses to disk and replays them
+
+    In 'record' mode requests go to the live site and every response is
+    saved under fixture_dir. In 'replay' mode responses are served from
+    fixture_dir only, after an optional simulated network latency, so
+    scraper runs are fast, offline and repeatable.
+    """
+
+    # Headers describing the wire encoding no longer apply to the stored body
+    DROPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+    def __init__(self, fixture_dir, mode='replay', latency=0.0):
+        super().__init__()
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'Unknown fixture mode "{mode}"')
+
+        self.fixture_dir = fixture_dir
+        self.mode = mode
+        self.latency = latency
+        self._live = HTTPAdapter() if mode == 'record' else None
+
+        self.stats = {
+            'requests': 0,
+            'misses': 0,
+            'bytes': 0,
+            'fetch_seconds': 0.0
+        }
+
+        os.makedirs(fixture_dir, exist_ok=True)
+
+    def _fixture_path(self, method, url):
+        """Get the fixture file for a request"""
+        key = hashlib.sha1(f"{method} {url}".encode()).hexdigest()[:16]
+        return os.path.join(self.fixture_dir, f"{key}.json")
+
+    def save_fixture(self, url, content, status=200, headers=None, method='GET', encoding='utf-8'):
+        """
+        Store a response body as the fixture for a URL
+
+        Args:
+            url: Fully prepared request URL, including the query string
+            content: Response body as bytes or str
+            status: HTTP status code to replay
+            headers: Optional response headers
+            method: HTTP method of the request
+            encoding: Text encoding of the body
+        """
+        if isinstance(content, str):
+            content = content.encode(encoding or 'utf-8')
+
+        headers = {
+            name: value for name, value in (headers or {}).items()
+            if name.lower() not in self.DROPPED_HEADERS
+        }
+
+        fixture = {
+            'method': method,
+            'url': url,
+            'status': status,
+            'headers': headers,
+            'encoding': encoding,
+            'body': base64.b64encode(content).decode('ascii')
+        }
+
+        with open(self._fixture_path(method, url), 'w') as f:
+            json.dump(fixture, f)
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        try:
+            if self.mode == 'record':
+                response = self._live.send(request, **kwargs)
+                self.save_fixture(
+                    request.url, response.content,
+                    status=response.status_code,
+                    headers=dict(response.headers),
+                    method=request.method,
+                    encoding=response.encoding
+                )
+            else:
+                response = self._replay(request)
+        finally:
+            self.stats['requests'] += 1
+            self.stats['fetch_seconds'] += time.perf_counter() - started
+
+        self.stats['bytes'] += len(response.content)
+        return response
+
+    def _replay(self, request):
+        """Build a response from the stored fixture for a request"""
+        path = self._fixture_path(request.method, request.url)
+        if not os.path.exists(path):
+            self.stats['misses'] += 1
+            raise requests.ConnectionError(f"No fixture recorded for {request.method} {request.url}")
+
+        with open(path, 'r') as f:
+            fixture = json.load(f)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        content = base64.b64decode(fixture['body'])
+
+        response = Response()
+        response.status_code = fixture['status']
+        response.headers = CaseInsensitiveDict(fixture['headers'])
+        response.headers['Content-Length'] = str(len(content))
+        response._content = content
+        response.encoding = fixture.get('encoding')
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        if self._live:
+            self._live.close()
+
+
+def use_fixtures(scraper, fixture_dir, mode='replay', latency=0.0, keep_rate_limit=False):
+    """
+    Route a scraper's session through a FixtureAdapter
+
+    Args:
+        scraper: EdJoinScraper or K12JobSpotScraper instance
+        fixture_dir: Directory holding the recorded fixtures
+        mode: 'record' to capture live responses, 'replay' to serve them
+        latency: Simulated network latency in seconds for replayed requests
+        keep_rate_limit: Keep the politeness delay when replaying
+
+    Returns:
+        The mounted FixtureAdapter, whose stats cover every request made
+    """
+    adapter = FixtureAdapter(fixture_dir, mode=mode, latency=latency)
+    scraper.session.mount('http://', adapter)
+    scraper.session.mount('https://', adapter)
+
+    # There is no one to be polite to when nothing leaves the machine
+    if mode == 'replay' and not keep_rate_limit:
+        scraper.request_delay = 0
+
+    return adapter
@@ -0,0 +1,232 @@
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import func
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(value):
+    """Fallback conversions for the stdlib encoder"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(data):
+    """Encode data as compact JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+# Compiled projections kept per serializer; fields and truncate come from
+# the query string, so the oldest combination is dropped past this many
+MAX_PROJECTIONS = 64
+
+
+class Projection:
+    """
+    A compiled column selection for RowSerializer
+
+    The id and version columns are always selected (appended after the
+    requested ones when not requested) so encoded rows can be cached.
+    """
+
+    def __init__(self, serializer, keys, truncate):
+        self.keys = list(keys)
+        self.truncate = truncate
+        self.tag = (tuple(self.keys), truncate)
+
+        self.columns = []
+        for key in self.keys:
+            attr, _ = serializer.field_map[key]
+            column = getattr(serializer.model, attr)
+            if truncate and key in serializer.truncatable:
+                # Truncate in SQL so the full text never leaves the database
+                column = func.substr(column, 1, truncate).label(attr)
+            self.columns.append(column)
+
+        attrs = [serializer.field_map[key][0] for key in self.keys]
+        for attr in ('id', serializer.version_attr):
+            if attr not in attrs:
+                attrs.append(attr)
+                self.columns.append(getattr(serializer.model, attr))
+
+        self.attrs = attrs
+        self.id_index = attrs.index('id')
+        self.version_index = attrs.index(serializer.version_attr)
+
+        # Both encoders write enums as .value and datetimes as .isoformat(),
+        # so only JSON list columns need converting (None becomes [])
+        self.list_indexes = [
+            index for index, key in enumerate(self.keys) if serializer.field_map[key][1] == 'list'
+        ]
+
+
+class RowSerializer:
+    """
+    Serializes projected column tuples of a model straight to JSON
+
+    The model declares SERIALIZED_FIELDS as (JSON key, attribute, kind)
+    triples in to_dict order. List queries select only the columns of a
+    Projection via `query.with_entities(*projection.columns)`, so no ORM
+    objects are built and unrequested Text columns are never loaded.
+    Projections are compiled once and memoized. Encoded rows are kept in
+    an LRU keyed by projection and primary key, and invalidated whenever
+    the row's version column (its last update time) changes.
+    """
+
+    def __init__(self, model, version_attr, cache_size=0):
+        self.model = model
+        self.version_attr = version_attr
+        self.fields = model.SERIALIZED_FIELDS
+        self.field_map = {key: (attr, kind) for key, attr, kind in self.fields}
+        self.truncatable = set(getattr(model, 'TRUNCATABLE_FIELDS', []))
+
+        self._lock = threading.Lock()
+        self._projections = {}
+        self.full = self.project()
+        self.keys = self.full.keys
+        self.columns = self.full.columns
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def project(self, keys=None, truncate=None):
+        """
+        Get the compiled projection for a set of fields
+
+        Args:
+            keys: JSON keys to include; None for every serialized field
+            truncate: Maximum length of the model's TRUNCATABLE_FIELDS
+
+        Returns:
+            Projection, with keys in SERIALIZED_FIELDS order
+
+        Raises:
+            ValueError: If a key is not a serialized field
+        """
+        if keys is None:
+            keys = [key for key, _, _ in self.fields]
+        else:
+            unknown = [key for key in keys if key not in self.field_map]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+            requested = set(keys)
+            keys = [key for key, _, _ in self.fields if key in requested]
+
+        if truncate is not None and truncate <= 0:
+            raise ValueError('truncate must be a positive number of characters')
+
+        tag = (tuple(keys), truncate)
+        with self._lock:
+            projection = self._projections.get(tag)
+            if projection is None:
+                if len(self._projections) >= MAX_PROJECTIONS:
+                    self._projections.pop(next(iter(self._projections)))
+                projection = Projection(self, keys, truncate)
+                self._projections[tag] = projection
+        return projection
+
+    def project_from_args(self, args):
+        """
+        Get the projection requested by list query parameters
+
+        Supports `fields=a,b,c`, `view=summary` (the model's SUMMARY_FIELDS
+        with long text truncated to SUMMARY_TRUNCATE characters) and
+        `truncate=N` to cut long text fields to N characters.
+        """
+        keys = None
+        truncate = args.get('truncate', type=int)
+
+        view = args.get('view')
+        if view == 'summary':
+            keys = self.model.SUMMARY_FIELDS
+            if truncate is None:
+                truncate = self.model.SUMMARY_TRUNCATE
+        elif view and view != 'full':
+            raise ValueError(f'Unknown view "{view}"')
+
+        fields = args.get('fields')
+        if fields:
+            keys = [key.strip() for key in fields.split(',') if key.strip()]
+
+        return self.project(keys, truncate)
+
+    def row_to_dict(self, row, projection=None):
+        """Convert a projected row into the same dictionary as to_dict()"""
+        projection = projection or self.full
+
+        # zip stops at the requested keys, dropping appended id/version columns
+        if not projection.list_indexes:
+            return dict(zip(projection.keys, row))
+
+        values = list(row)
+        for index in projection.list_indexes:
+            if values[index] is None:
+                values[index] = []
+        return dict(zip(projection.keys, values))
+
+    def encode_row(self, row, projection=None):
+        """Encode a projected row as JSON bytes, reusing the cached encoding when current"""
+        projection = projection or self.full
+
+        if not self.cache_size:
+            return dumps(self.row_to_dict(row, projection))
+
+        key = (projection.tag, row[projection.id_index])
+        version = row[projection.version_index]
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        encoded = dumps(self.row_to_dict(row, projection))
+
+        with self._lock:
+            self._cache[key] = (version, encoded)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return encoded
+
+    def encode_list(self, rows, key, projection=None, extra=None):
+        """
+        Encode rows as a list response body
+
+        Args:
+            rows: Rows from a with_entities(*projection.columns) query
+            key: Name of the list in the response (e.g. 'jobs')
+            projection: Projection the rows were selected with; defaults
+                to every serialized field
+            extra: Optional mapping of additional top-level members
+
+        Returns:
+            JSON bytes shaped like {"success": true, key: [...], "count": n}
+        """
+        items = [self.encode_row(row, projection) for row in rows]
+        members = b''.join(
+            b',' + dumps(name) + b':' + dumps(value) for name, value in (extra or {}).items()
+        )
+        return b''.join([
+            b'{"success":true,"', key.encode('utf-8'), b'":[',
+            b','.join(items),
+            b'],"count":', str(len(items)).encode('ascii'), members, b'}'
+        ])
+
+    def invalidate(self):
+        """Drop every cached row encoding"""
+        with self._lock:
+            self._cache.clear()
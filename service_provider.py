@@ -1,8 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-# db will be injected from app.py
-db = None
+from app.extensions import db
 
 class ExperienceLevel(Enum):
     BEGINNER = "Beginner"
@@ -46,6 +45,41 @@ class ServiceProvider(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # (JSON key, attribute, kind) in to_dict order, used by the projected
+    # list serializer in app.services.serializers
+    SERIALIZED_FIELDS = [
+        ('id', 'id', None),
+        ('name', 'name', None),
+        ('bio', 'bio', None),
+        ('specialties', 'specialties', 'list'),
+        ('programs', 'programs', 'list'),
+        ('experienceLevel', 'experience_level', 'enum'),
+        ('location', 'location', None),
+        ('state', 'state', None),
+        ('services', 'services', 'list'),
+        ('rates', 'rates', None),
+        ('availability', 'availability', None),
+        ('contactEmail', 'contact_email', None),
+        ('contactPhone', 'contact_phone', None),
+        ('website', 'website', None),
+        ('socialMedia', 'social_media', None),
+        ('certifications', 'certifications', 'list'),
+        ('experience', 'experience', None),
+        ('status', 'status', 'enum'),
+        ('rating', 'rating', None),
+        ('createdAt', 'created_at', 'datetime'),
+        ('updatedAt', 'updated_at', 'datetime')
+    ]
+    
+    # Fields returned by list endpoints with view=summary, and the long
+    # text fields that may be truncated in SQL
+    SUMMARY_FIELDS = [
+        'id', 'name', 'bio', 'specialties', 'programs', 'experienceLevel',
+        'location', 'state', 'rates', 'status', 'rating'
+    ]
+    TRUNCATABLE_FIELDS = ['bio']
+    SUMMARY_TRUNCATE = 200
+    
     def to_dict(self):
         return {
             'id': self.id,
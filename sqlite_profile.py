@@ -0,0 +1,90 @@
+"""
+SQLite production profile
+
+Applied to file-backed SQLite databases (see app.py). Every pooled
+connection runs SQLITE_PRAGMAS when it is opened:
+
+    journal_mode=WAL     Readers and the single writer no longer block each
+                         other: a reader sees the last committed snapshot
+                         while the scraper is mid-transaction, and a commit
+                         never waits for open reads to finish.
+    synchronous=NORMAL   In WAL mode this fsyncs at checkpoints rather than
+                         every commit. A committed transaction survives an
+                         application crash; only an OS crash or power loss
+                         can roll back the most recent commits, and the
+                         database is never corrupted.
+    busy_timeout         Concurrent writers queue for the write lock for up
+                         to this long instead of failing immediately with
+                         "database is locked".
+    cache_size/mmap_size Larger page cache and memory-mapped reads per
+                         connection.
+
+Concurrency guarantees: any number of concurrent readers, exactly one
+writer at a time (others wait up to busy_timeout), snapshot isolation for
+each read transaction. WAL needs every process to share the host's memory
+so the database file must not live on a network filesystem.
+
+Connections are kept in a QueuePool so the pragmas and page cache are paid
+for once per connection rather than once per request.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,        # milliseconds
+    'cache_size': -64000,        # negative means KiB, so 64 MiB
+    'mmap_size': 268435456,      # 256 MiB
+    'temp_store': 'MEMORY'
+}
+
+
+def is_sqlite_file(uri):
+    """True for SQLite URIs backed by a file rather than memory"""
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+def sqlite_engine_options(uri, pool_size=10, max_overflow=10):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for the production profile
+
+    Args:
+        uri: Database URI
+        pool_size: Connections kept open in the pool
+        max_overflow: Extra connections allowed under burst load
+
+    Returns:
+        Dictionary of engine options, empty for anything but file SQLite
+    """
+    if not is_sqlite_file(uri):
+        return {}
+
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'connect_args': {
+            # Pooled connections are handed between request threads
+            'check_same_thread': False,
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000
+        }
+    }
+
+
+def apply_sqlite_pragmas(engine, pragmas=None):
+    """Run the profile's pragmas on every new connection of a SQLite engine"""
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
@@ -0,0 +1,121 @@
+# Characters of a key stored in the trie; longer prefixes are finished by
+# filtering the entries below that depth
+MAX_DEPTH = 16
+
+# Completions cached per trie node, the most a request can ask for
+TOP_SIZE = 20
+
+
+def normalize(text):
+    """Lowercase with whitespace collapsed, the form keys and prefixes are compared in"""
+    return ' '.join(text.lower().split())
+
+
+def _keys(value):
+    """A value is completed from the start of any of its words"""
+    text = normalize(value)
+    return [text[index:] for index in range(len(text)) if index == 0 or text[index - 1] == ' ']
+
+
+class _Node:
+    __slots__ = ('children', 'entries', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = set()  # (key, value) pairs whose key ends (or is cut off) here
+        self.top = None  # Cached best values of the subtree
+
+
+class PrefixIndex:
+    """
+    Frequency-weighted prefix trie of one field's values
+
+    Each distinct value is stored under the start of each of its words
+    ("Round Rock ISD" completes "rou", "roc" and "isd") and weighted by
+    how many rows have it. Every node caches the best TOP_SIZE values of
+    its subtree; a change to a value's count clears the caches on its
+    paths, and a cleared node is rebuilt from its children's caches, so
+    lookups stay a walk down the prefix.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+        self.counts = {}
+
+    def add(self, value):
+        """Count one more row having value"""
+        if not value:
+            return
+        count = self.counts.get(value, 0)
+        self.counts[value] = count + 1
+        for key in _keys(value):
+            node = self.root
+            node.top = None
+            for char in key[:MAX_DEPTH]:
+                node = node.children.setdefault(char, _Node())
+                node.top = None
+            node.entries.add((key, value))
+
+    def remove(self, value):
+        """Count one row fewer having value"""
+        count = self.counts.get(value)
+        if not count:
+            return
+        if count > 1:
+            self.counts[value] = count - 1
+        else:
+            del self.counts[value]
+
+        for key in _keys(value):
+            path = [self.root]
+            for char in key[:MAX_DEPTH]:
+                node = path[-1].children.get(char)
+                if node is None:
+                    break
+                path.append(node)
+            for node in path:
+                node.top = None
+            if count == 1:
+                path[-1].entries.discard((key, value))
+                # Prune the branch nodes left empty
+                for depth in range(len(path) - 1, 0, -1):
+                    node = path[depth]
+                    if node.entries or node.children:
+                        break
+                    del path[depth - 1].children[key[depth - 1]]
+
+    def _top(self, node):
+        if node.top is None:
+            # A value among the node's best is among its child's best too
+            values = {value for _, value in node.entries}
+            for child in node.children.values():
+                values.update(self._top(child))
+            node.top = sorted(values, key=lambda value: (-self.counts[value], value))[:TOP_SIZE]
+        return node.top
+
+    def complete(self, prefix, limit=TOP_SIZE):
+        """
+        Most frequent values with a word starting with prefix
+
+        Returns:
+            List of (value, count), most frequent first
+        """
+        prefix = normalize(prefix)
+        node = self.root
+        for char in prefix[:MAX_DEPTH]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        if len(prefix) <= MAX_DEPTH:
+            values = self._top(node)[:limit]
+        else:
+            matched = set()
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                matched.update(value for key, value in current.entries if key.startswith(prefix))
+                stack.extend(current.children.values())
+            values = sorted(matched, key=lambda value: (-self.counts[value], value))[:limit]
+
+        return [(value, self.counts[value]) for value in values]
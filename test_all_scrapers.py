@@ -10,11 +10,13 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.services.edjoin_scraper import EdJoinScraper
 from app.services.k12jobspot_scraper import K12JobSpotScraper
+from app.services.scraper_fixtures import use_fixtures
+import argparse
 import json
 from datetime import datetime
 
-def test_scraper(scraper_class, scraper_name):
-    """Test a specific scraper class"""
+def test_scraper(scraper_class, scraper_name, fixture_dir=None):
+    """Test a specific scraper class, replaying fixtures when a directory is given"""
     print(f"\n{'='*60}")
     print(f"Testing {scraper_name} Scraper")
     print(f"{'='*60}")
@@ -22,6 +24,9 @@ def test_scraper(scraper_class, scraper_name):
     try:
         # Initialize scraper
         scraper = scraper_class()
+        if fixture_dir:
+            use_fixtures(scraper, os.path.join(fixture_dir, scraper_name.lower()))
+            print(f"  Replaying fixtures from {fixture_dir}")
         print(f"✓ {scraper_name} scraper initialized successfully")
         print(f"  Base URL: {scraper.base_url}")
         print(f"  Search URL: {scraper.search_url}")
@@ -95,12 +100,38 @@ def test_scraper(scraper_class, scraper_name):
             'error': str(e)
         }
 
+def test_keyword_filter():
+    """Check the local filter for batched queries keeps cheer and dance postings only"""
+    postings = [
+        ({'title': 'Varsity Cheerleading Coach', 'description': ''}, True),
+        ({'title': 'Head Cheer Coach', 'description': 'Leads the cheerleaders'}, True),
+        ({'title': 'Dance Team Advisor', 'description': ''}, True),
+        ({'title': 'Pom Squad Coach', 'description': 'Pom-pon routines'}, True),
+        ({'title': 'Spirit Squad Coach', 'description': ''}, True),
+        ({'title': 'Attendance Clerk', 'description': 'Under the guidance of the principal'}, False),
+        ({'title': 'Head Football Coach', 'description': 'Pomona USD, in accordance with board policy'}, False),
+        ({'title': 'Counselor', 'description': 'Pomona Unified School District'}, False)
+    ]
+    
+    for scraper_class in (EdJoinScraper, K12JobSpotScraper):
+        scraper = scraper_class()
+        for job_data, expected in postings:
+            assert scraper._matches_keywords(job_data) == expected, (scraper_class.__name__, job_data['title'])
+    
+    print("   ✓ Keyword filter drops attendance, guidance and Pomona postings")
+
 def main():
     """Run comprehensive scraper tests"""
+    parser = argparse.ArgumentParser(description='Run the job scraper test suite')
+    parser.add_argument('--fixtures', help='Replay recorded fixtures from this directory instead of the live sites')
+    args = parser.parse_args()
+    
     print("Cheer Guru Connect - Job Scraper Test Suite")
     print(f"Test run: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*60)
     
+    test_keyword_filter()
+    
     # Test all scrapers
     scrapers_to_test = [
         (EdJoinScraper, "EdJoin"),
@@ -110,7 +141,7 @@ def main():
     results = []
     
     for scraper_class, scraper_name in scrapers_to_test:
-        result = test_scraper(scraper_class, scraper_name)
+        result = test_scraper(scraper_class, scraper_name, args.fixtures)
         results.append(result)
     
     # Summary
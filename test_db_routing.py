@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for read replica routing
+Uses two SQLite files holding different jobs, so every read shows which
+database answered it
+"""
+
+import sys
+import os
+import tempfile
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+
+from app import create_app, db, Job, JobType, ProgramType, JobStatus
+from app.services.db_routing import use_primary
+
+
+def make_job(job_id):
+    now = datetime.utcnow()
+    return Job(
+        id=job_id, title='Varsity Cheer Coach', description='Lead practices',
+        type=list(JobType)[0], program=ProgramType.CHEERLEADING, location='Austin', state='TX',
+        organization='Round Rock ISD', posted_date=now, status=JobStatus.ACTIVE,
+        scraped_at=now, last_updated=now
+    )
+
+
+@contextmanager
+def replica_app():
+    """App whose primary holds primary-job and whose replica holds replica-job"""
+    directory = tempfile.mkdtemp()
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(directory, 'primary.db')}",
+        'DATABASE_REPLICA_URL': f"sqlite:///{os.path.join(directory, 'replica.db')}",
+        'FUZZY_SEARCH': False,
+        'JOB_SUGGESTIONS': False,
+        'QUERY_CACHE_SIZE': 0,
+        'TESTING': True
+    })
+    with app.app_context():
+        for bind, job_id in ((None, 'primary-job'), ('replica', 'replica-job')):
+            engine = db.engines[bind]
+            db.metadata.create_all(engine)
+            with engine.begin() as conn:
+                conn.execute(Job.__table__.insert(), [{
+                    column.key: getattr(make_job(job_id), column.key) for column in Job.__table__.columns
+                }])
+    try:
+        yield app
+    finally:
+        # init_app registered a MetaData for the bind on the shared db;
+        # later apps without a replica would fail db.create_all() on it
+        db.metadatas.pop('replica', None)
+
+
+def job_ids():
+    return sorted(job.id for job in Job.query.all())
+
+
+def test_get_reads_from_replica():
+    """GET requests are answered from the replica"""
+    with replica_app() as app:
+        response = app.test_client().get('/api/jobs/?fields=id')
+        assert response.status_code == 200, response.get_json()
+        assert [job['id'] for job in response.get_json()['jobs']] == ['replica-job']
+
+        # Outside a request everything uses the primary
+        with app.app_context():
+            assert job_ids() == ['primary-job']
+
+
+def test_read_after_write_uses_primary():
+    """Once a request has written, its later reads go to the primary"""
+    with replica_app() as app, app.test_request_context('/api/jobs/', method='GET'):
+        assert job_ids() == ['replica-job']
+        db.session.add(make_job('new-job'))
+        db.session.flush()
+        assert job_ids() == ['new-job', 'primary-job']
+        db.session.rollback()
+
+
+def test_use_primary_forces_primary():
+    """use_primary() sends a GET request's reads to the primary"""
+    with replica_app() as app, app.test_request_context('/api/jobs/', method='GET'):
+        with use_primary(db.session):
+            assert job_ids() == ['primary-job']
+        assert job_ids() == ['replica-job']
+
+
+if __name__ == "__main__":
+    print("Testing read replica routing...")
+    print("=" * 50)
+    for test in (test_get_reads_from_replica, test_read_after_write_uses_primary, test_use_primary_forces_primary):
+        test()
+        print(f"   ✓ {test.__doc__}")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the list response cache
+Checks that requests whose parameters differ are never answered from
+each other's cache entries
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Test against a throwaway in-memory database
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from datetime import datetime
+
+from app import create_app, db, Job, JobType, ProgramType, JobStatus
+
+
+def make_app(cache_size):
+    """App with the given query cache size and two jobs"""
+    app = create_app({'QUERY_CACHE_SIZE': cache_size, 'FUZZY_SEARCH': False, 'TESTING': True})
+    with app.app_context():
+        db.create_all()
+        now = datetime.utcnow()
+        for job_id, title, state in (('job-1', 'Varsity Cheer Coach', 'TX'), ('job-2', 'Headcoach Spirit', 'CA')):
+            db.session.add(Job(
+                id=job_id, title=title, description='Lead practices',
+                type=list(JobType)[0], program=ProgramType.CHEERLEADING, location='Austin', state=state,
+                organization='Round Rock ISD', posted_date=now, status=JobStatus.ACTIVE,
+                scraped_at=now, last_updated=now
+            ))
+        db.session.commit()
+    return app
+
+
+def titles(client, query):
+    response = client.get(f'/api/jobs/?{query}&fields=title')
+    assert response.status_code == 200, response.get_json()
+    return sorted(job['title'] for job in response.get_json()['jobs'])
+
+
+def test_whitespace_is_part_of_the_key():
+    """Parameters differing only by whitespace get their own responses"""
+    for query in ('search=%20coach', 'state=%20TX'):
+        expected = titles(make_app(0).test_client(), query)
+
+        client = make_app(256).test_client()
+        unpadded = titles(client, query.replace('%20', ''))
+        assert titles(client, query) == expected, query
+        assert unpadded != expected, query
+
+
+if __name__ == "__main__":
+    print("Testing query cache...")
+    print("=" * 50)
+    for test in (test_whitespace_is_part_of_the_key,):
+        test()
+        print(f"   ✓ {test.__doc__}")
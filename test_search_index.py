@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory search indexes
+Edits jobs and providers through the API and checks that fuzzy search
+sees the change right away, without waiting for a reconciliation
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Test against a throwaway in-memory database
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from datetime import datetime
+
+from app import create_app, db, Job, JobType, ProgramType, JobStatus, ServiceProvider, ExperienceLevel, ServiceStatus
+
+
+def make_app():
+    """App with fuzzy search and a fresh schema"""
+    app = create_app({'FUZZY_SEARCH': True, 'QUERY_CACHE_SIZE': 0, 'TESTING': True})
+    with app.app_context():
+        db.create_all()
+        now = datetime.utcnow()
+        db.session.add(Job(
+            id='job-1', title='Varsity Cheer Coach', description='Lead practices',
+            type=list(JobType)[0], program=ProgramType.CHEERLEADING, location='Austin', state='TX',
+            organization='Round Rock ISD', posted_date=now, status=JobStatus.ACTIVE,
+            scraped_at=now, last_updated=now
+        ))
+        db.session.add(ServiceProvider(
+            id='provider-1', name='Alice Smith', bio='Cheer choreographer', programs=['Cheerleading'],
+            location='Dallas', state='TX', experience_level=list(ExperienceLevel)[0],
+            status=list(ServiceStatus)[0], rating=4.5, created_at=now, updated_at=now
+        ))
+        db.session.commit()
+    return app
+
+
+def fuzzy_names(client, search):
+    response = client.get(f'/api/providers/?search={search}&match=fuzzy&fields=name')
+    assert response.status_code == 200, response.get_json()
+    return [provider['name'] for provider in response.get_json()['providers']]
+
+
+def fuzzy_titles(client, search):
+    response = client.get(f'/api/jobs/?search={search}&match=fuzzy&fields=title')
+    assert response.status_code == 200, response.get_json()
+    return [job['title'] for job in response.get_json()['jobs']]
+
+
+def test_provider_edit_is_searchable():
+    """Renaming a provider is visible to fuzzy search immediately"""
+    client = make_app().test_client()
+
+    # Build both indexes before the write
+    assert fuzzy_names(client, 'alice') == ['Alice Smith']
+    assert fuzzy_titles(client, 'cheer') == ['Varsity Cheer Coach']
+
+    response = client.put('/api/providers/provider-1', json={'name': 'Zelda Jones'})
+    assert response.status_code == 200, response.get_json()
+
+    assert fuzzy_names(client, 'zelda') == ['Zelda Jones']
+    assert fuzzy_names(client, 'zeldq') == ['Zelda Jones']
+    assert fuzzy_names(client, 'alice') == []
+
+
+def test_job_and_provider_edits_stay_apart():
+    """A job write reaches only the job index, a provider write only the provider index"""
+    app = make_app()
+    client = app.test_client()
+    assert fuzzy_names(client, 'alice') == ['Alice Smith']
+    assert fuzzy_titles(client, 'cheer') == ['Varsity Cheer Coach']
+
+    client.put('/api/jobs/job-1', json={'title': 'Dance Team Director'})
+    client.put('/api/providers/provider-1', json={'name': 'Zelda Jones'})
+
+    assert fuzzy_titles(client, 'dnace') == ['Dance Team Director']
+    assert fuzzy_names(client, 'zelda') == ['Zelda Jones']
+
+    indexes = app.extensions['row_indexes']
+    with app.app_context():
+        assert set(indexes['jobs']._slot_by_id) == {'job-1'}
+        assert set(indexes['service_providers']._slot_by_id) == {'provider-1'}
+
+
+if __name__ == "__main__":
+    print("Testing search indexes...")
+    print("=" * 50)
+    for test in (test_provider_edit_is_searchable, test_job_and_provider_edits_stay_apart):
+        test()
+        print(f"   ✓ {test.__doc__}")
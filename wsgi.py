@@ -0,0 +1,16 @@
+"""
+WSGI entry point for production servers
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+or simply `python main.py`, which starts gunicorn with the same settings.
+"""
+
+from app import create_app
+from app.extensions import db
+
+app = create_app()
+
+with app.app_context():
+    # Create any missing tables before workers start serving
+    db.create_all()